@@ -0,0 +1,469 @@
+"""
+Local stand-in for the Harris County Clerk court search site (cclerk.hctx.net).
+
+Serves just enough of the real site for HarrisCountyScraper to run end to end offline:
+the login page, the civil case search form, paginated ListViewCases results, case
+pages with the events grid (HyperLinkFCEC download links), the Parties postback view
+and PDF downloads. Like the real site, search and paging are ASP.NET postbacks: the
+results only exist as the response to a POST from the search form or the pager, so a
+results page cannot be reloaded from its URL. Page counts and response latencies are configurable so crawl speed
+can be benchmarked and regression-tested without credentials.
+
+Usage (from the project root):
+    python -m bench.court_site_server --port 8765 --pages 5 --cases-per-page 20 --latency 0.2
+
+Then point the scraper at it:
+    HarrisCountyScraper(..., base_url='http://127.0.0.1:8765')
+
+Request counts per route are served as JSON from /__stats.
+"""
+import argparse
+import html
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlencode, urlparse
+
+LOGIN_PATH = '/Applications/WebSearch/Registration/Login.aspx'
+SEARCH_PATH = '/Applications/WebSearch/CourtSearch.aspx'
+CASE_PATH = '/Applications/WebSearch/CaseDetails.aspx'
+DOCUMENT_PATH = '/Applications/WebSearch/ViewECdocs.aspx'
+STATS_PATH = '/__stats'
+NEXT_PAGE_TARGET = 'ctl00$ContentPlaceHolder1$ListViewCases$DataPager1$ctl00$NextButton'
+SEARCH_BUTTON_NAME = 'ctl00$ContentPlaceHolder1$btnSearchCase'
+
+SESSION_COOKIE = 'ASP.NET_SessionId'
+MATCHING_CASE_TYPE = 'CONTRACT - CONSUMER/COMMERCIAL/DEBT'
+OTHER_CASE_TYPES = [
+    'INJURY OR DAMAGE - MOTOR VEHICLE',
+    'REAL PROPERTY - EVICTION APPEAL',
+    'OTHER CIVIL',
+]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><title>{title}</title>
+<script type="text/javascript">
+function __doPostBack(eventTarget, eventArgument) {{
+    var form = document.forms['aspnetForm'];
+    form.__EVENTTARGET.value = eventTarget;
+    form.__EVENTARGUMENT.value = eventArgument;
+    form.submit();
+}}
+</script>
+</head>
+<body>
+<form name="aspnetForm" id="aspnetForm" method="post" action="{action}">
+<input type="hidden" name="__EVENTTARGET" id="__EVENTTARGET" value="" />
+<input type="hidden" name="__EVENTARGUMENT" id="__EVENTARGUMENT" value="" />
+<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{viewstate}" />
+{body}
+</form>
+</body>
+</html>
+"""
+
+# -----------------------
+# Fake data
+# -----------------------
+def build_pdf(lines):
+    """
+    Builds a minimal single-page PDF with the given lines of text.
+    """
+    content_lines = ["BT", "/F1 12 Tf", "72 720 Td", "16 TL"]
+    for line in lines:
+        escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+        content_lines.append(f"({escaped}) Tj T*")
+    content_lines.append("ET")
+    stream = "\n".join(content_lines).encode('latin-1')
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return pdf
+
+class CourtSiteFixture:
+    """
+    Generated case data plus the knobs that control how the stand-in site behaves.
+
+    Args:
+        pages (int): Result pages returned for a search over the full `days` window.
+        cases_per_page (int): Cases listed on each results page.
+        days (int): Filing dates are spread evenly over this many days, ending today.
+        matching_ratio (float): Fraction of cases with the CONTRACT - CONSUMER/COMMERCIAL/DEBT type.
+        latency (float): Seconds to wait before answering each page request.
+        download_latency (float): Seconds to wait before answering each PDF download.
+        username (str | None), password (str | None): Required credentials; any are accepted if None.
+        seed (int): Seed for the generated names, amounts and courts.
+    """
+    def __init__(self, pages=5, cases_per_page=20, days=7, matching_ratio=0.5, latency=0.0,
+                 download_latency=0.0, username=None, password=None, seed=0):
+        self.cases_per_page = cases_per_page
+        self.latency = latency
+        self.download_latency = download_latency
+        self.username = username
+        self.password = password
+        self.sessions = set()
+        self.stats = {}
+        self.stats_lock = threading.Lock()
+        self.cases = self.generate_cases(pages * cases_per_page, days, matching_ratio, random.Random(seed))
+        self.cases_by_number = {case['case_number']: case for case in self.cases}
+
+    def generate_cases(self, total_cases, days, matching_ratio, rng):
+        today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+        first_names = ['JOHN', 'MARIA', 'JAMES', 'LINDA', 'ROBERT', 'PATRICIA', 'DAVID', 'ELENA']
+        last_names = ['SMITH', 'GARCIA', 'JOHNSON', 'NGUYEN', 'BROWN', 'LOPEZ', 'DAVIS', 'MILLER']
+        plaintiffs = ['MIDLAND CREDIT MANAGEMENT INC', 'CAPITAL ONE NA', 'LVNV FUNDING LLC', 'DISCOVER BANK']
+        cases = []
+        for i in range(total_cases):
+            # Newest cases first, like the real results list
+            file_date = today - timedelta(days=(i * days) // max(total_cases, 1))
+            matching = rng.random() < matching_ratio
+            cases.append({
+                'case_number': str(1200000 + total_cases - i),
+                'file_date': file_date,
+                'type_desc': MATCHING_CASE_TYPE if matching else rng.choice(OTHER_CASE_TYPES),
+                'defendant': f"{rng.choice(first_names)} {rng.choice(last_names)}",
+                'address': f"{rng.randint(100, 9999)} MAIN ST\nHOUSTON, TX 770{rng.randint(10, 99)}",
+                'plaintiff': rng.choice(plaintiffs),
+                'attorney': f"{rng.choice(last_names)} & ASSOCIATES PC\n{rng.randint(100, 999)} LOUISIANA ST",
+                'court_number': rng.randint(1, 4),
+                'damages': f"${rng.randint(1000, 20000):,}.{rng.randint(0, 99):02d}",
+                'pages': rng.randint(2, 12),
+            })
+        return cases
+
+    def search(self, from_date, to_date):
+        return [case for case in self.cases if from_date <= case['file_date'] <= to_date]
+
+    def document_pdf(self, case):
+        return build_pdf([
+            f"CAUSE NO. {case['case_number']}",
+            f"IN THE COUNTY CIVIL COURT AT LAW NO. {case['court_number']}",
+            "HARRIS COUNTY, TEXAS",
+            f"{case['plaintiff']}, Plaintiff, v. {case['defendant']}, Defendant.",
+            "PLAINTIFF'S ORIGINAL PETITION",
+            f"Plaintiff seeks damages in the amount of {case['damages']} plus court costs.",
+        ])
+
+    def count(self, route):
+        with self.stats_lock:
+            self.stats[route] = self.stats.get(route, 0) + 1
+
+# -----------------------
+# HTML views
+# -----------------------
+def login_action(return_url):
+    return f"{LOGIN_PATH}?ReturnUrl={quote(return_url, safe='')}"
+
+def render_login(error=""):
+    return f"""<h2>Login</h2>
+<p style="color:red">{html.escape(error)}</p>
+<input type="text" name="UserName" id="ctl00_ContentPlaceHolder1_Login1_UserName" />
+<input type="password" name="Password" id="ctl00_ContentPlaceHolder1_Login1_Password" />
+<input type="submit" value="Log In" id="ctl00_ContentPlaceHolder1_Login1_LoginButton" />"""
+
+def render_search_form(from_str="", to_str=""):
+    # Fields and button post back to CourtSearch.aspx through the page's aspnetForm
+    return f"""<input type="text" name="ctl00$ContentPlaceHolder1$txtFrom" id="ctl00_ContentPlaceHolder1_txtFrom" value="{html.escape(from_str)}" />
+<input type="text" name="ctl00$ContentPlaceHolder1$txtTo" id="ctl00_ContentPlaceHolder1_txtTo" value="{html.escape(to_str)}" />
+<input type="submit" name="{SEARCH_BUTTON_NAME}" value="Search" id="ctl00_ContentPlaceHolder1_btnSearchCase" />"""
+
+def results_viewstate(from_str, to_str, page):
+    """
+    Stand-in for ASP.NET view state: the search the pager posts back belongs to.
+    """
+    return urlencode({'txtFrom': from_str, 'txtTo': to_str, 'page': page})
+
+def render_results(cases, page, cases_per_page, from_str, to_str):
+    total_pages = max(1, -(-len(cases) // cases_per_page))
+    page_cases = cases[(page - 1) * cases_per_page: page * cases_per_page]
+    rows = []
+    for i, case in enumerate(page_cases):
+        rows.append(f"""<tr class="{'even' if i % 2 == 0 else 'odd'}">
+<td><a class="doclinks" href="{CASE_PATH}?CaseNumber={case['case_number']}">{case['case_number']}</a></td>
+<td>{case['file_date'].strftime('%m/%d/%Y')}</td>
+<td>{html.escape(case['plaintiff'])} vs. {html.escape(case['defendant'])}</td>
+<td>County Civil Court at Law No. {case['court_number']}</td>
+<td>Active</td>
+<td>{html.escape(case['type_desc'])}</td>
+</tr>""")
+
+    if page < total_pages:
+        next_link = f'<a href="javascript:__doPostBack(\'{NEXT_PAGE_TARGET}\',\'\')">Next</a>'
+    else:
+        next_link = '<a disabled="disabled">Next</a>'
+
+    return f"""{render_search_form(from_str, to_str)}
+<p>{len(cases)} cases found. Page {page} of {total_pages}.</p>
+<table>
+<tbody id="ctl00_ContentPlaceHolder1_ListViewCases_itemContainer">
+{''.join(rows)}
+</tbody>
+</table>
+<div class="pager">{next_link}</div>"""
+
+def render_case(case):
+    doc_rows = [
+        ("Civil Case Information Sheet", 1),
+        ("Plaintiff's Original Petition", case['pages']),
+        ("Citation Issued", 2),
+    ]
+    events = []
+    for i, (description, pages) in enumerate(doc_rows):
+        prefix = f"ctl00_ContentPlaceHolder1_gridViewEvents_ctl02_ChildGrid_ctl0{i + 2}"
+        href = f"{DOCUMENT_PATH}?CaseNumber={case['case_number']}&amp;Doc={i}"
+        events.append(f"""<tr>
+<td>{case['file_date'].strftime('%m/%d/%Y')}</td>
+<td><span id="{prefix}_lblDocDesc">{html.escape(description)}</span></td>
+<td>{i + 1}</td>
+<td>E-Filed</td>
+<td>{pages}</td>
+<td><a id="{prefix}_HyperLinkFCEC" href="{href}">View</a></td>
+</tr>""")
+
+    return f"""<table id="ctl00_ContentPlaceHolder1_gridViewCase">
+<tr><td>{case['case_number']}</td><td>{html.escape(case['type_desc'])}</td>
+<td><a href="javascript:__doPostBack('ctl00$ContentPlaceHolder1$gridViewCase','Parties$0')">Parties</a></td></tr>
+</table>
+<table id="ctl00_ContentPlaceHolder1_gridViewEvents">
+<tr><td>
+<table class="Nested_ChildGrid">
+{''.join(events)}
+</table>
+</td></tr>
+</table>"""
+
+def render_parties(case):
+    defendant = html.escape(case['defendant'] + "\n" + case['address']).replace("\n", "<br>")
+    attorney = html.escape(case['attorney']).replace("\n", "<br>")
+    prefix = "ctl00_ContentPlaceHolder1_GridViewParties"
+    return f"""<table id="{prefix}">
+<tr><td>Plaintiff</td><td><span id="{prefix}_ctl02_lblStyle">{html.escape(case['plaintiff'])}</span></td>
+<td><span id="{prefix}_ctl02_lblAttorney_lblStyle">{attorney}</span></td></tr>
+<tr><td>Defendant</td><td><span id="{prefix}_ctl03_lblStyle">{defendant}</span></td>
+<td></td></tr>
+</table>"""
+
+# -----------------------
+# HTTP server
+# -----------------------
+def make_handler(site):
+    class CourtSiteHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def send_html(self, title, body, action="", viewstate="", status=200, headers=None):
+            data = PAGE_TEMPLATE.format(
+                title=title, action=action, viewstate=html.escape(viewstate), body=body
+            ).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            # ASP.NET's default: cacheable by the browser, so history navigation works as on the real site
+            self.send_header('Cache-Control', 'private')
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def redirect(self, location, headers=None):
+            self.send_response(302)
+            self.send_header('Location', location)
+            self.send_header('Content-Length', '0')
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+
+        def logged_in(self):
+            for cookie in self.headers.get('Cookie', '').split(';'):
+                name, _, value = cookie.strip().partition('=')
+                if name == SESSION_COOKIE and value in site.sessions:
+                    return True
+            return False
+
+        def require_login(self):
+            if self.logged_in():
+                return True
+            self.redirect(f"{LOGIN_PATH}?ReturnUrl={quote(self.path, safe='')}")
+            return False
+
+        def read_form(self):
+            length = int(self.headers.get('Content-Length', 0))
+            return {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode('utf-8')).items()}
+
+        def send_results(self, from_str, to_str, page):
+            try:
+                from_date = datetime.strptime(from_str.strip(), '%m/%d/%Y')
+                to_date = datetime.strptime(to_str.strip(), '%m/%d/%Y')
+            except ValueError:
+                self.send_html("Court Search", render_search_form() + "<p>Invalid date.</p>", action=self.path)
+                return
+            cases = site.search(from_date, to_date)
+            self.send_html(
+                "Court Search",
+                render_results(cases, page, site.cases_per_page, from_str, to_str),
+                action=self.path,
+                viewstate=results_viewstate(from_str, to_str, page),
+            )
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            site.count(f"GET {url.path}")
+
+            if url.path == STATS_PATH:
+                data = json.dumps(site.stats).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                return
+
+            if url.path == DOCUMENT_PATH:
+                time.sleep(site.download_latency)
+                if not self.require_login():
+                    return
+                case = site.cases_by_number.get(query.get('CaseNumber'))
+                if case is None:
+                    self.send_error(404)
+                    return
+                data = site.document_pdf(case)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/pdf')
+                self.send_header('Content-Disposition', f'attachment; filename="{case["case_number"]}_{uuid.uuid4().hex[:8]}.pdf"')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                return
+
+            time.sleep(site.latency)
+            if url.path == LOGIN_PATH:
+                self.send_html("Login", render_login(), action=login_action(query.get('ReturnUrl', SEARCH_PATH)))
+            elif url.path == SEARCH_PATH:
+                # A GET always shows an empty search form; results only come from postbacks
+                if not self.require_login():
+                    return
+                self.send_html("Court Search", render_search_form(), action=self.path)
+            elif url.path == CASE_PATH:
+                if not self.require_login():
+                    return
+                case = site.cases_by_number.get(query.get('CaseNumber'))
+                if case is None:
+                    self.send_error(404)
+                    return
+                self.send_html(f"Case {case['case_number']}", render_case(case), action=self.path)
+            else:
+                self.send_error(404)
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            form = self.read_form()
+            site.count(f"POST {url.path}")
+            time.sleep(site.latency)
+
+            if url.path == LOGIN_PATH:
+                return_url = query.get('ReturnUrl', SEARCH_PATH)
+                if site.username is not None and (form.get('UserName') != site.username
+                                                  or form.get('Password') != site.password):
+                    self.send_html("Login", render_login("Invalid username or password."), action=login_action(return_url))
+                    return
+                session_id = uuid.uuid4().hex
+                site.sessions.add(session_id)
+                self.redirect(return_url, {'Set-Cookie': f'{SESSION_COOKIE}={session_id}; Path=/'})
+            elif url.path == SEARCH_PATH:
+                if not self.require_login():
+                    return
+                if SEARCH_BUTTON_NAME in form:
+                    self.send_results(form.get('ctl00$ContentPlaceHolder1$txtFrom', ''),
+                                      form.get('ctl00$ContentPlaceHolder1$txtTo', ''), 1)
+                elif form.get('__EVENTTARGET') == NEXT_PAGE_TARGET and form.get('__VIEWSTATE'):
+                    state = {k: v[0] for k, v in parse_qs(form['__VIEWSTATE']).items()}
+                    self.send_results(state.get('txtFrom', ''), state.get('txtTo', ''), int(state.get('page', 1)) + 1)
+                else:
+                    self.send_html("Court Search", render_search_form(), action=self.path)
+            elif url.path == CASE_PATH:
+                if not self.require_login():
+                    return
+                case = site.cases_by_number.get(query.get('CaseNumber'))
+                if case is None:
+                    self.send_error(404)
+                    return
+                if form.get('__EVENTARGUMENT', '').startswith('Parties'):
+                    self.send_html(f"Case {case['case_number']} Parties", render_parties(case), action=self.path)
+                else:
+                    self.send_html(f"Case {case['case_number']}", render_case(case), action=self.path)
+            else:
+                self.send_error(404)
+
+    return CourtSiteHandler
+
+def start_server(site, host='127.0.0.1', port=0):
+    """
+    Starts the stand-in site on a background thread.
+    Returns (server, base_url); call server.shutdown() when done.
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Harris County court search site.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--pages', type=int, default=5)
+    parser.add_argument('--cases-per-page', type=int, default=20)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--matching-ratio', type=float, default=0.5)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to each page response.")
+    parser.add_argument('--download-latency', type=float, default=0.0, help="Seconds added to each PDF download.")
+    parser.add_argument('--username')
+    parser.add_argument('--password')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    site = CourtSiteFixture(
+        pages=args.pages,
+        cases_per_page=args.cases_per_page,
+        days=args.days,
+        matching_ratio=args.matching_ratio,
+        latency=args.latency,
+        download_latency=args.download_latency,
+        username=args.username,
+        password=args.password,
+        seed=args.seed,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(site))
+    print(f"Serving {len(site.cases)} cases at http://{args.host}:{args.port}{LOGIN_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Import-time budget check for the entry point modules.
+
+Imports each module in a fresh interpreter and fails (exit code 1) if the import takes
+longer than the budget or pulls in any of the heavy scraper/OCR dependencies, which
+should only load when their stage first runs.
+
+Usage (from the project root):
+    python -m bench.import_budget
+    python -m bench.import_budget --budget 0.3 --modules main ocr.ocr
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+DEFAULT_MODULES = ['main', 'ocr.ocr', 'metrics.metrics']
+
+HEAVY_MODULES = [
+    'selenium',
+    'webdriver_manager',
+    'cv2',
+    'numpy',
+    'pdf2image',
+    'pytesseract',
+    'PIL',
+    'PyPDF2',
+    'google.generativeai',
+    'requests',
+]
+
+CHILD_CODE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{'seconds': seconds, 'heavy': heavy}}))
+"""
+
+def measure_import(module, repeats=3):
+    """
+    Imports the module in `repeats` fresh interpreters.
+    Returns the fastest import time in seconds and the heavy modules it loaded.
+    """
+    best = None
+    heavy = []
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, '-c', CHILD_CODE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True,
+        )
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        best = data['seconds'] if best is None else min(best, data['seconds'])
+        heavy = data['heavy']
+    return best, heavy
+
+def slowest_imports(module, top=10):
+    """
+    Returns the slowest imports (cumulative microseconds, name) reported by `python -X importtime`.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        # Lines look like "import time:   self [us] | cumulative | imported package"
+        fields = line[len('import time:'):].split('|')
+        if not line.startswith('import time:') or len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        rows.append((int(fields[1]), fields[2].strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check import time of the entry point modules.")
+    parser.add_argument('--modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--budget', type=float, default=0.5, help="Maximum import time per module, in seconds.")
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.modules:
+        try:
+            seconds, heavy = measure_import(module, args.repeats)
+        except subprocess.CalledProcessError as e:
+            print(f"FAIL {module}: import raised\n{e.stderr}")
+            failed = True
+            continue
+
+        problems = []
+        if seconds > args.budget:
+            problems.append(f"{seconds:.3f}s > {args.budget:.3f}s budget")
+        if heavy:
+            problems.append(f"loads {', '.join(heavy)}")
+
+        if problems:
+            failed = True
+            print(f"FAIL {module}: {'; '.join(problems)}")
+            for cumulative_us, name in slowest_imports(module):
+                print(f"    {cumulative_us / 1e6:8.3f}s  {name}")
+        else:
+            print(f"ok   {module}: {seconds:.3f}s")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
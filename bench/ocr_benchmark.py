@@ -0,0 +1,368 @@
+"""
+Offline extraction benchmark and regression harness over the labeled PDF set.
+
+Runs every PDF in the test data set through the OCR pipeline (rasterize, preprocess,
+OCR, extract), times each stage, measures pages/second and peak RSS, and scores the
+extracted dollar amount and court number against the manually created results file.
+
+Usage (from the project root):
+    python -m bench.ocr_benchmark --llm stub --output bench_results.json
+    python -m bench.ocr_benchmark --llm record --recordings test/ocr/llm_recordings.json
+    python -m bench.ocr_benchmark --llm replay --recordings test/ocr/llm_recordings.json \\
+        --workers 4 --baseline bench_baseline.json
+
+LLM backends:
+    gemini  call the live Gemini API (same as production)
+    record  call Gemini and save every response to --recordings
+    replay  answer from --recordings only (offline, reproducible)
+    stub    answer with local regex heuristics (offline, no recordings needed)
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from ocr import ocr
+
+DEFAULT_PDF_DIR = 'test/ocr/test_data_set'
+DEFAULT_EXPECTED_FILE = 'test/ocr/test_results_dataset.txt'
+DEFAULT_RECORDINGS_FILE = 'test/ocr/llm_recordings.json'
+
+STAGES = ('rasterize', 'preprocess', 'ocr', 'extract')
+
+# -----------------------
+# LLM backends
+# -----------------------
+COURT_PROMPT_PREFIX = "Analyze the following text and extract the court number"
+
+def prompt_kind(prompt):
+    return 'court' if prompt.startswith(COURT_PROMPT_PREFIX) else 'damages'
+
+def prompt_text(prompt):
+    return prompt.split("Text:\n", 1)[-1]
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class RecordedBackend:
+    """
+    Replays Gemini responses keyed by PDF and prompt kind ('<pdf id>:damages', '<pdf id>:court'),
+    so changes to rasterizing, preprocessing or Tesseract still replay and get scored.
+    Each recording keeps a hash of the OCR text it was made from; replaying it for different
+    text is counted in `stale` and warned about, not treated as an error.
+    In record mode, prompts without a (current) recording are sent to Gemini and the
+    responses are kept in new_recordings so the caller can save them.
+
+    Set pdf_id before running each PDF's prompts.
+    """
+    def __init__(self, recordings, record=False):
+        self.recordings = recordings
+        self.record = record
+        self.new_recordings = {}
+        self.stale = []
+        self.pdf_id = None
+
+    def __call__(self, prompt):
+        key = f"{self.pdf_id}:{prompt_kind(prompt)}"
+        current_hash = text_hash(prompt_text(prompt))
+        recording = self.recordings.get(key)
+        if recording is not None and (recording['text_sha256'] == current_hash or not self.record):
+            if recording['text_sha256'] != current_hash:
+                print(f"Warning: recording {key} was made from different OCR text; run with --llm record to refresh it.")
+                self.stale.append(key)
+            return recording['response']
+        if not self.record:
+            raise KeyError(f"No recorded LLM response for {key}")
+        response_text = ocr.generate_with_gemini(prompt)
+        self.new_recordings[key] = {'response': response_text, 'text_sha256': current_hash}
+        return response_text
+
+class StubBackend:
+    """
+    Answers the damages and court prompts with local regex heuristics instead of an LLM.
+    """
+    court_pattern = re.compile(r'County\s*Civil\s*Court\s*at\s*Law\s*No\.?\s*(\d+)', re.IGNORECASE)
+
+    def __call__(self, prompt):
+        text = prompt_text(prompt)
+        if prompt_kind(prompt) == 'court':
+            match = self.court_pattern.search(text)
+            court_number = match.group(1) if match else "-1"
+            return f"Harris County - County Civil Court at Law No. {court_number}"
+        return ocr.find_damages_and_value(text)
+
+def load_recordings(recordings_file):
+    if recordings_file and os.path.exists(recordings_file):
+        with open(recordings_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def save_recordings(recordings_file, recordings):
+    os.makedirs(os.path.dirname(recordings_file) or '.', exist_ok=True)
+    with open(recordings_file, 'w', encoding='utf-8') as f:
+        json.dump(recordings, f, indent=2, sort_keys=True)
+
+def make_backend(llm, recordings_file):
+    if llm == 'gemini':
+        return None
+    if llm == 'stub':
+        return StubBackend()
+    return RecordedBackend(load_recordings(recordings_file), record=(llm == 'record'))
+
+# -----------------------
+# Scoring helpers
+# -----------------------
+def load_expected(expected_file):
+    """
+    Reads the labeled results file, one '<dollar amount>, <court number>' line per PDF
+    (line 1 is 1.pdf, line 2 is 2.pdf, ...).
+    """
+    expected = {}
+    with open(expected_file, 'r', encoding='utf-8') as f:
+        for i, line in enumerate(f, start=1):
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            dollar_amount, _, court_number = line.rpartition(', ')
+            expected[str(i)] = {'dollar_amount': dollar_amount, 'court_number': court_number.strip()}
+    return expected
+
+def pdf_sort_key(pdf_path):
+    # Numeric file names (1.pdf, 2.pdf, ...) sort numerically, everything else alphabetically
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    return (0, int(stem), '') if stem.isdigit() else (1, 0, stem)
+
+def list_pdfs(pdf_dir, ids=None):
+    pdfs = []
+    for file_name in os.listdir(pdf_dir):
+        stem, ext = os.path.splitext(file_name)
+        if ext.lower() != '.pdf' or (ids and stem not in ids):
+            continue
+        pdfs.append(os.path.join(pdf_dir, file_name))
+    return sorted(pdfs, key=pdf_sort_key)
+
+# -----------------------
+# Benchmark
+# -----------------------
+def benchmark_pdf(pdf_path, backend=None, dpi=300):
+    """
+    Runs one PDF through the OCR pipeline stage by stage and returns its timings and extracted fields.
+    Retries are bypassed so timings reflect a single pass.
+    """
+    ocr.set_llm_backend(backend)
+    timings = dict.fromkeys(STAGES, 0.0)
+    record = {'pdf': os.path.basename(pdf_path), 'pages': 0, 'error': None}
+    if isinstance(backend, RecordedBackend):
+        backend.pdf_id = os.path.splitext(record['pdf'])[0]
+        backend.new_recordings = {}
+        backend.stale = []
+
+    try:
+        start = time.perf_counter()
+        pages = ocr.rasterize_pdf(pdf_path, dpi=dpi)
+        timings['rasterize'] = time.perf_counter() - start
+        record['pages'] = len(pages)
+
+        text = ""
+        for page_number, page_image in enumerate(pages, start=1):
+            start = time.perf_counter()
+            processed_image = ocr.preprocess_image_to_remove_watermark(page_image, None, page_number)
+            timings['preprocess'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            text += ocr.ocr_image(processed_image) + "\n\n"
+            timings['ocr'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        damages = ocr.extract_damages_with_gemini.__wrapped__(text)
+        court_name = ocr.extract_court_names_with_gemini.__wrapped__(text)
+        timings['extract'] = time.perf_counter() - start
+
+        record['damages'] = damages
+        record['court_name'] = court_name
+        record['dollar_amount'] = ocr.find_dollar_amount(damages)
+        record['court_number'] = ocr.find_court_number(court_name)
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+
+    record['timings'] = timings
+    if isinstance(backend, RecordedBackend):
+        record['new_recordings'] = backend.new_recordings
+        record['stale_recordings'] = backend.stale
+    return record
+
+def peak_rss_mb(who):
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    max_rss = resource.getrusage(who).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+def score(records, expected):
+    """
+    Computes field-level accuracy of the extracted dollar amounts and court numbers.
+    """
+    totals = {'dollar_amount': 0, 'court_number': 0, 'both': 0}
+    scored = 0
+    for record in records:
+        truth = expected.get(os.path.splitext(record['pdf'])[0])
+        if truth is None:
+            continue
+        scored += 1
+        dollar_ok = record.get('dollar_amount') == truth['dollar_amount']
+        court_ok = record.get('court_number') == truth['court_number']
+        record['expected'] = truth
+        record['correct'] = {'dollar_amount': dollar_ok, 'court_number': court_ok}
+        totals['dollar_amount'] += dollar_ok
+        totals['court_number'] += court_ok
+        totals['both'] += dollar_ok and court_ok
+    accuracy = {field: (count / scored if scored else None) for field, count in totals.items()}
+    return accuracy, scored
+
+def run_benchmark(pdfs, expected, backend=None, workers=1, dpi=300):
+    start = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            records = list(executor.map(benchmark_pdf, pdfs, [backend] * len(pdfs), [dpi] * len(pdfs)))
+    else:
+        records = [benchmark_pdf(pdf_path, backend, dpi) for pdf_path in pdfs]
+    wall_time = time.perf_counter() - start
+
+    total_pages = sum(record['pages'] for record in records)
+    accuracy, scored = score(records, expected)
+    summary = {
+        'files': len(records),
+        'errors': sum(1 for record in records if record['error']),
+        'stale_recordings': sum(len(record.get('stale_recordings', [])) for record in records),
+        'pages': total_pages,
+        'scored': scored,
+        'wall_time_s': wall_time,
+        'pages_per_second': total_pages / wall_time if wall_time else 0.0,
+        'stage_time_s': {stage: sum(record['timings'][stage] for record in records) for stage in STAGES},
+        'peak_rss_mb': {
+            'self': peak_rss_mb(resource.RUSAGE_SELF),
+            'children': peak_rss_mb(resource.RUSAGE_CHILDREN),
+        },
+        'accuracy': accuracy,
+    }
+    return summary, records
+
+# -----------------------
+# Baseline comparison
+# -----------------------
+def compare_to_baseline(summary, baseline, accuracy_tolerance=0.0, speed_tolerance=0.2, memory_tolerance=0.2):
+    """
+    Compares a run summary against a baseline summary.
+    Returns a list of human readable regressions (empty if none).
+
+    Args:
+        accuracy_tolerance (float): Allowed absolute drop in any accuracy field.
+        speed_tolerance (float): Allowed relative drop in pages/second.
+        memory_tolerance (float): Allowed relative growth in peak RSS.
+    """
+    regressions = []
+    for field, value in summary['accuracy'].items():
+        base_value = baseline['accuracy'].get(field)
+        if value is not None and base_value is not None and value < base_value - accuracy_tolerance:
+            regressions.append(f"accuracy.{field}: {value:.3f} < baseline {base_value:.3f}")
+
+    base_speed = baseline.get('pages_per_second') or 0
+    if base_speed and summary['pages_per_second'] < base_speed * (1 - speed_tolerance):
+        regressions.append(f"pages_per_second: {summary['pages_per_second']:.2f} < baseline {base_speed:.2f}")
+
+    for who, value in summary['peak_rss_mb'].items():
+        base_value = baseline['peak_rss_mb'].get(who) or 0
+        if base_value and value > base_value * (1 + memory_tolerance):
+            regressions.append(f"peak_rss_mb.{who}: {value:.1f} > baseline {base_value:.1f}")
+    return regressions
+
+def print_summary(summary):
+    print(f"Files: {summary['files']} ({summary['errors']} errors), pages: {summary['pages']}")
+    if summary['stale_recordings']:
+        print(f"Stale LLM recordings replayed: {summary['stale_recordings']} (OCR text changed since recording)")
+    print(f"Wall time: {summary['wall_time_s']:.2f}s, {summary['pages_per_second']:.2f} pages/s")
+    for stage, seconds in summary['stage_time_s'].items():
+        print(f"  {stage:<10} {seconds:8.2f}s")
+    print(f"Peak RSS: {summary['peak_rss_mb']['self']:.1f} MB (self), {summary['peak_rss_mb']['children']:.1f} MB (children)")
+    for field, value in summary['accuracy'].items():
+        shown = f"{value:.3f}" if value is not None else "n/a"
+        print(f"Accuracy {field}: {shown} ({summary['scored']} scored)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark OCR extraction over the labeled PDF set.")
+    parser.add_argument('--pdf-dir', default=DEFAULT_PDF_DIR, help="Directory of numbered PDFs (1.pdf, 2.pdf, ...).")
+    parser.add_argument('--expected', default=DEFAULT_EXPECTED_FILE, help="Labeled results file, one line per PDF.")
+    parser.add_argument('--ids', nargs='*', help="Only run these PDF numbers.")
+    parser.add_argument('--llm', choices=('gemini', 'record', 'replay', 'stub'), default='replay')
+    parser.add_argument('--recordings', default=DEFAULT_RECORDINGS_FILE, help="Recorded LLM responses (record/replay).")
+    parser.add_argument('--workers', type=int, default=1, help="Number of worker processes.")
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--output', help="Write machine-readable results (JSON) to this path.")
+    parser.add_argument('--baseline', help="Results JSON from a previous run to compare against.")
+    parser.add_argument('--accuracy-tolerance', type=float, default=0.0)
+    parser.add_argument('--speed-tolerance', type=float, default=0.2)
+    parser.add_argument('--memory-tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    if args.llm == 'replay' and not os.path.exists(args.recordings):
+        print(f"No recordings file at {args.recordings}. Run once with --llm record, or use --llm stub.")
+        return 1
+
+    backend = make_backend(args.llm, args.recordings)
+    expected = load_expected(args.expected) if os.path.exists(args.expected) else {}
+    pdfs = list_pdfs(args.pdf_dir, set(args.ids) if args.ids else None)
+    if not pdfs:
+        print(f"No PDFs found in {args.pdf_dir}")
+        return 1
+
+    summary, records = run_benchmark(pdfs, expected, backend, args.workers, args.dpi)
+    summary['config'] = {
+        'llm': args.llm,
+        'workers': args.workers,
+        'dpi': args.dpi,
+        'pdf_dir': args.pdf_dir,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+    }
+
+    if args.llm == 'record':
+        recordings = dict(backend.recordings)
+        for record in records:
+            recordings.update(record.get('new_recordings', {}))
+        save_recordings(args.recordings, recordings)
+        print(f"Saved {len(recordings)} recorded LLM responses to {args.recordings}")
+    for record in records:
+        record.pop('new_recordings', None)
+
+    print_summary(summary)
+    for record in records:
+        if record['error']:
+            print(f"ERROR {record['pdf']}: {record['error']}")
+        elif record.get('correct') and not all(record['correct'].values()):
+            print(f"INCORRECT {record['pdf']}: got {record['dollar_amount']}, {record['court_number']} "
+                  f"expected {record['expected']['dollar_amount']}, {record['expected']['court_number']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'records': records}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['summary']
+        regressions = compare_to_baseline(
+            summary, baseline, args.accuracy_tolerance, args.speed_tolerance, args.memory_tolerance
+        )
+        if regressions:
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
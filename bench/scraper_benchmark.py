@@ -0,0 +1,138 @@
+"""
+End-to-end scraper benchmark against the local stand-in court site.
+
+Starts bench/court_site_server.py on a background thread, runs HarrisCountyScraper
+through login, search and scrape against it, and reports time per phase and cases
+per minute. Gemini is replaced by the stub LLM backend so the run is fully offline
+(OCR still runs on the downloaded PDFs).
+
+Usage (from the project root):
+    python -m bench.scraper_benchmark --pages 3 --cases-per-page 10 --latency 0.2 --output scraper_bench.json
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from bench.court_site_server import CourtSiteFixture, start_server
+from bench.ocr_benchmark import StubBackend
+from metrics import metrics
+from ocr import ocr
+from scrape.harris.harris_county_scraper import HarrisCountyScraper
+
+def count_lines(file_path):
+    if not os.path.exists(file_path):
+        return 0
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return sum(1 for line in f if line.strip())
+
+def run_scraper_benchmark(site, days=7, poll_interval=None, work_dir=None, spans_file=None, browser_profile='default',
+                          recycle_after_cases=None):
+    """
+    Runs one full scrape against the stand-in site and returns a summary dict,
+    including the per-stage metrics histograms.
+    """
+    metrics.configure(spans_file=spans_file)
+    server, base_url = start_server(site)
+    work_dir = work_dir or tempfile.mkdtemp(prefix='scraper_bench_')
+    output_file = os.path.join(work_dir, 'defendant_data.txt')
+    ocr.set_llm_backend(StubBackend())
+
+    timings = {}
+    start = time.perf_counter()
+    scraper = HarrisCountyScraper(
+        username='bench_user',
+        password='bench_pass',
+        download_dir=os.path.join(work_dir, 'downloaded_docs'),
+        output_file=output_file,
+        base_url=base_url,
+        browser_profile=browser_profile,
+        recycle_after_cases=recycle_after_cases,
+    )
+    timings['browser_start'] = time.perf_counter() - start
+    if poll_interval is not None:
+        scraper.download_poll_interval = poll_interval
+
+    try:
+        for phase, run in (
+            ('login', scraper.login),
+            ('search', lambda: scraper.search_cases(days=days)),
+            ('scrape', scraper.scrape_cases),
+        ):
+            start = time.perf_counter()
+            run()
+            timings[phase] = time.perf_counter() - start
+    finally:
+        scraper.quit()
+        server.shutdown()
+        ocr.set_llm_backend(None)
+
+    # Same window search_cases(days=days) asks the site for
+    today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+    listed = len(site.search(today - timedelta(days=days), today))
+    cases_written = count_lines(output_file)
+    total_time = sum(timings.values())
+    return {
+        'base_url': base_url,
+        'browser_profile': browser_profile,
+        'work_dir': work_dir,
+        'cases_listed': listed,
+        'cases_written': cases_written,
+        'timings_s': timings,
+        'total_time_s': total_time,
+        'cases_per_minute': cases_written / (timings['scrape'] / 60) if timings.get('scrape') else 0.0,
+        'listed_cases_per_minute': listed / (timings['scrape'] / 60) if timings.get('scrape') else 0.0,
+        'requests': dict(site.stats),
+        'metrics': metrics.summary(),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HarrisCountyScraper against the local stand-in court site.")
+    parser.add_argument('--pages', type=int, default=2)
+    parser.add_argument('--cases-per-page', type=int, default=10)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--matching-ratio', type=float, default=0.5)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to each page response.")
+    parser.add_argument('--download-latency', type=float, default=0.0, help="Seconds added to each PDF download.")
+    parser.add_argument('--browser-profile', choices=('default', 'performance'), default='default')
+    parser.add_argument('--recycle-after-cases', type=int, help="Restart the browser after this many cases.")
+    parser.add_argument('--poll-interval', type=float, help="Override the scraper's download poll interval.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keep-work-dir', action='store_true', help="Keep the downloads/output directory.")
+    parser.add_argument('--output', help="Write the summary (JSON) to this path.")
+    parser.add_argument('--spans', help="Write per-case metrics spans (JSONL) to this path.")
+    args = parser.parse_args(argv)
+
+    site = CourtSiteFixture(
+        pages=args.pages,
+        cases_per_page=args.cases_per_page,
+        days=args.days,
+        matching_ratio=args.matching_ratio,
+        latency=args.latency,
+        download_latency=args.download_latency,
+        seed=args.seed,
+    )
+    summary = run_scraper_benchmark(site, days=args.days, poll_interval=args.poll_interval, spans_file=args.spans,
+                                    browser_profile=args.browser_profile, recycle_after_cases=args.recycle_after_cases)
+    if not args.keep_work_dir:
+        shutil.rmtree(summary['work_dir'], ignore_errors=True)
+
+    print(f"Cases listed: {summary['cases_listed']}, cases written: {summary['cases_written']}")
+    for phase, seconds in summary['timings_s'].items():
+        print(f"  {phase:<14} {seconds:8.2f}s")
+    print(f"{summary['cases_per_minute']:.2f} written cases/min, "
+          f"{summary['listed_cases_per_minute']:.2f} listed cases/min")
+    metrics.report()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,14 @@
 import os
 import re
 import csv
+import sys
 import string
+import argparse
 from dotenv import load_dotenv
-from scrape.harris.harris_county_scraper import HarrisCountyScraper
-from ocr.ocr import process_pdf_and_find_damages
+from metrics import metrics
+
+# The scraper (selenium) and OCR (cv2, pytesseract, Gemini) stacks are imported inside the
+# commands that use them, so CSV-only commands start quickly.
 
 def convert_txt_to_csv(input_txt_file, output_csv_file):
     """
@@ -153,7 +157,33 @@ def verify_csv(input_csv_file, verified_csv_file, filtered_csv_file):
 # Load environment variables from .env file
 load_dotenv()
 
-def main():
+def long_run_options():
+    """
+    Browser recycling limits for long runs, from the .env file:
+    RECYCLE_AFTER_CASES restarts Chrome after that many cases and
+    MAX_BROWSER_RSS_MB restarts it once Chrome uses more memory than that.
+    """
+    recycle_after_cases = os.getenv("RECYCLE_AFTER_CASES")
+    max_browser_rss_mb = os.getenv("MAX_BROWSER_RSS_MB")
+    return {
+        'recycle_after_cases': int(recycle_after_cases) if recycle_after_cases else None,
+        'max_browser_rss_mb': float(max_browser_rss_mb) if max_browser_rss_mb else None,
+    }
+
+def main(days=7, incremental=False, state_file=None, overlap_days=1):
+    """
+    Scrapes the last `days` days of cases, OCRs the petitions and writes the verified CSVs.
+
+    Args:
+        days (int): Size of the search window (first run only, in incremental mode).
+        incremental (bool): Resume from the high-water mark in state_file instead of
+            re-walking the whole window, skipping case numbers that were already processed.
+        state_file (str | None): Incremental crawl state (JSON).
+        overlap_days (int): Days to re-search before the high-water mark in incremental mode.
+    """
+    from scrape.harris.harris_county_scraper import HarrisCountyScraper
+    from scrape.crawl_state import CrawlState
+
     # Fetch username and password from environment variables
     username = os.getenv("USERNAME")
     password = os.getenv("PASSWORD")
@@ -161,38 +191,219 @@ def main():
     if not username or not password:
         raise ValueError("USERNAME and PASSWORD must be set in the .env file.")
 
+    # Optional per-stage timing: set METRICS_SPANS_FILE (and optionally METRICS_SUMMARY_FILE) in the .env file
+    spans_file = os.getenv("METRICS_SPANS_FILE")
+    if spans_file:
+        metrics.configure(spans_file=spans_file)
+
     # Configure the scraper
     scraper = HarrisCountyScraper(
         username=username,
         password=password,
         download_dir='/Users/isaaclam/guardian/marketing_leads_project/main/out/harris/downloaded_docs',
-        output_file='/Users/isaaclam/guardian/marketing_leads_project/main/out/harris/defendant_data.txt'
+        output_file='/Users/isaaclam/guardian/marketing_leads_project/main/out/harris/defendant_data.txt',
+        # BROWSER_PROFILE=performance runs headless with images/CSS/fonts blocked
+        browser_profile=os.getenv("BROWSER_PROFILE", "default"),
+        **long_run_options()
     )
 
+    crawl_state = None
+    if incremental:
+        state_file = state_file or '/Users/isaaclam/guardian/marketing_leads_project/main/out/harris/crawl_state.json'
+        crawl_state = CrawlState(state_file, overlap_days=overlap_days, default_days=days)
+
     try:
         # Perform the scraping tasks
         scraper.login()
-        scraper.search_cases(days=7)
+        if crawl_state is not None:
+            from_date = crawl_state.search_from_date(default_days=days)
+            print(f"Incremental run: searching from {from_date.strftime('%m/%d/%Y')}, "
+                  f"skipping {len(crawl_state.known_cases)} known cases.")
+            scraper.search_cases(days=days, from_date=from_date)
+        else:
+            scraper.search_cases(days=days)
         # scraper.search_cases(days=1)
-        scraper.scrape_cases()
-        
-        # Convert the TXT data to CSV
-        input_txt = '/Users/isaaclam/guardian/marketing_leads_project/main/out/harris/defendant_data.txt'
-        output_csv = '/Users/isaaclam/guardian/marketing_leads_project/main/out/harris/defendant_data.csv'
-        convert_txt_to_csv(input_txt, output_csv)
+        scraper.scrape_cases(crawl_state=crawl_state)
         
-        # Define the output file paths for verified CSV and filtered (non-flagged) CSV.
-        verified_csv = '/Users/isaaclam/guardian/marketing_leads_project/main/out/harris/defendant_data_verified.csv'
-        filtered_csv = '/Users/isaaclam/guardian/marketing_leads_project/main/out/harris/defendant_data_verified_filtered.csv'
-        
-        # Verify the CSV, add the 'flag' column, and create an additional file that excludes flagged rows.
-        verify_csv(output_csv, verified_csv, filtered_csv)
-        
-        print(f"CSV conversion complete.\nVerified CSV saved to {verified_csv}\nFiltered CSV (non-flagged rows) saved to {filtered_csv}")
+        # Convert the TXT data to CSV, then verify it
+        write_verified_csvs('/Users/isaaclam/guardian/marketing_leads_project/main/out/harris/defendant_data.txt')
         
     finally:
         # Ensure the browser is closed
         scraper.quit()
+        metrics.report(os.getenv("METRICS_SUMMARY_FILE"))
+
+def write_verified_csvs(input_txt):
+    """
+    Converts a scraped defendant_data.txt to defendant_data.csv next to it, then writes
+    defendant_data_verified.csv (all rows, flagged) and defendant_data_verified_filtered.csv
+    (non-flagged rows only) in the same directory.
+    """
+    out_dir = os.path.dirname(input_txt)
+    output_csv = os.path.join(out_dir, 'defendant_data.csv')
+    with metrics.timer('output.csv'):
+        convert_txt_to_csv(input_txt, output_csv)
+
+    # Define the output file paths for verified CSV and filtered (non-flagged) CSV.
+    verified_csv = os.path.join(out_dir, 'defendant_data_verified.csv')
+    filtered_csv = os.path.join(out_dir, 'defendant_data_verified_filtered.csv')
+
+    # Verify the CSV, add the 'flag' column, and create an additional file that excludes flagged rows.
+    with metrics.timer('output.verify_csv'):
+        verify_csv(output_csv, verified_csv, filtered_csv)
+
+    print(f"CSV conversion complete.\nVerified CSV saved to {verified_csv}\nFiltered CSV (non-flagged rows) saved to {filtered_csv}")
+
+OUTPUT_ROOT = '/Users/isaaclam/guardian/marketing_leads_project/main/out'
+
+def crawl(counties, days=7, incremental=False, overlap_days=1, ocr_workers=2, requests_per_minute=None):
+    """
+    Crawls several counties at once with the CrawlScheduler, sharing one OCR/extraction pool,
+    then writes each county's verified CSVs.
+
+    Per-county settings come from the .env file, falling back to the shared ones:
+        <COUNTY>_USERNAME / USERNAME, <COUNTY>_PASSWORD / PASSWORD,
+        <COUNTY>_REQUESTS_PER_MINUTE (else requests_per_minute),
+        OUTPUT_ROOT (output goes to OUTPUT_ROOT/<county>/).
+
+    Args:
+        counties (list[str]): Counties registered in scrape.county_scraper.SCRAPER_CLASSES.
+        days (int): Search window in days.
+        incremental (bool): Use each county's crawl_state.json high-water mark.
+        overlap_days (int): Days to re-search before the high-water mark in incremental mode.
+        ocr_workers (int): Size of the shared OCR process pool.
+        requests_per_minute (float | None): Default per-site rate limit.
+    """
+    from scrape.crawl_state import CrawlState
+    from scrape.scheduler import CrawlScheduler, SiteJob
+
+    spans_file = os.getenv("METRICS_SPANS_FILE")
+    if spans_file:
+        metrics.configure(spans_file=spans_file)
+
+    output_root = os.getenv("OUTPUT_ROOT", OUTPUT_ROOT)
+    jobs = []
+    for county in counties:
+        prefix = county.upper()
+        username = os.getenv(f"{prefix}_USERNAME") or os.getenv("USERNAME")
+        password = os.getenv(f"{prefix}_PASSWORD") or os.getenv("PASSWORD")
+        if not username or not password:
+            raise ValueError(f"{prefix}_USERNAME/{prefix}_PASSWORD (or USERNAME/PASSWORD) must be set in the .env file.")
+
+        county_dir = os.path.join(output_root, county)
+        crawl_state = None
+        if incremental:
+            crawl_state = CrawlState(os.path.join(county_dir, 'crawl_state.json'), overlap_days=overlap_days,
+                                     default_days=days)
+        site_rpm = os.getenv(f"{prefix}_REQUESTS_PER_MINUTE")
+        jobs.append(SiteJob(
+            county,
+            scraper_kwargs={
+                'username': username,
+                'password': password,
+                'download_dir': os.path.join(county_dir, 'downloaded_docs'),
+                'output_file': os.path.join(county_dir, 'defendant_data.txt'),
+                'browser_profile': os.getenv("BROWSER_PROFILE", "default"),
+                **long_run_options(),
+            },
+            days=days,
+            crawl_state=crawl_state,
+            requests_per_minute=float(site_rpm) if site_rpm else requests_per_minute,
+        ))
+
+    try:
+        results = CrawlScheduler(jobs, ocr_workers=ocr_workers).run()
+        for job in jobs:
+            output_file = job.scraper_kwargs['output_file']
+            if os.path.exists(output_file):
+                write_verified_csvs(output_file)
+    finally:
+        metrics.report(os.getenv("METRICS_SUMMARY_FILE"))
+    return results
+
+def cli(argv=None):
+    """
+    Command line entry point. With no command, runs the full scrape (same as `run`).
+
+        python main.py [run] [--days N] [--incremental [--state-file F] [--overlap-days N]]
+        python main.py convert-csv <input.txt> <output.csv>
+        python main.py verify-csv <input.csv> <verified.csv> <filtered.csv>
+        python main.py batch-ocr <pdf_dir|manifest.txt> --out-dir <dir> [--workers N]
+        python main.py crawl --counties harris [...] [--ocr-workers N] [--requests-per-minute N]
+    """
+    parser = argparse.ArgumentParser(description="Scrape court cases and extract leads.")
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help="Scrape, OCR and write the verified CSVs (default).")
+    run_parser.add_argument('--days', type=int, default=7, help="Search window in days.")
+    run_parser.add_argument('--incremental', action='store_true',
+                            help="Search only from the last run's high-water mark and skip known cases.")
+    run_parser.add_argument('--state-file', help="Incremental crawl state file (JSON).")
+    run_parser.add_argument('--overlap-days', type=int, default=1,
+                            help="Days to re-search before the high-water mark in incremental mode.")
+
+    convert_parser = subparsers.add_parser('convert-csv', help="Convert the scraped TXT file to CSV.")
+    convert_parser.add_argument('input_txt')
+    convert_parser.add_argument('output_csv')
+
+    verify_parser = subparsers.add_parser('verify-csv', help="Flag rows of a converted CSV and write the filtered CSV.")
+    verify_parser.add_argument('input_csv')
+    verify_parser.add_argument('verified_csv')
+    verify_parser.add_argument('filtered_csv')
+
+    batch_parser = subparsers.add_parser('batch-ocr', help="OCR and extract a directory or manifest of downloaded PDFs.")
+    batch_parser.add_argument('source', help="Directory of PDFs, or a manifest file with one PDF path per line.")
+    batch_parser.add_argument('--out-dir', required=True, help="Directory for the per-PDF JSON results.")
+    batch_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    batch_parser.add_argument('--recursive', action='store_true', help="Include PDFs in subdirectories.")
+    batch_parser.add_argument('--retry-errors', action='store_true', help="Re-process PDFs whose previous result failed.")
+    batch_parser.add_argument('--limit', type=int, help="Process at most this many PDFs.")
+
+    crawl_parser = subparsers.add_parser('crawl', help="Crawl several counties concurrently with a shared OCR pool.")
+    crawl_parser.add_argument('--counties', nargs='+', default=['harris'])
+    crawl_parser.add_argument('--days', type=int, default=7, help="Search window in days.")
+    crawl_parser.add_argument('--incremental', action='store_true',
+                              help="Search only from each county's high-water mark and skip known cases.")
+    crawl_parser.add_argument('--overlap-days', type=int, default=1)
+    crawl_parser.add_argument('--ocr-workers', type=int, default=2, help="Size of the shared OCR process pool.")
+    crawl_parser.add_argument('--requests-per-minute', type=float,
+                              help="Default per-site rate limit (override with <COUNTY>_REQUESTS_PER_MINUTE).")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'crawl':
+        results = crawl(
+            args.counties,
+            days=args.days,
+            incremental=args.incremental,
+            overlap_days=args.overlap_days,
+            ocr_workers=args.ocr_workers,
+            requests_per_minute=args.requests_per_minute,
+        )
+        return 1 if any(result['error'] for result in results) else 0
+    elif args.command == 'batch-ocr':
+        from ocr.batch import run_batch
+
+        summary = run_batch(
+            args.source,
+            args.out_dir,
+            workers=args.workers,
+            recursive=args.recursive,
+            retry_errors=args.retry_errors,
+            limit=args.limit,
+        )
+        return 1 if summary['failed'] else 0
+    elif args.command == 'convert-csv':
+        convert_txt_to_csv(args.input_txt, args.output_csv)
+        print(f"CSV saved to {args.output_csv}")
+    elif args.command == 'verify-csv':
+        verify_csv(args.input_csv, args.verified_csv, args.filtered_csv)
+        print(f"Verified CSV saved to {args.verified_csv}\nFiltered CSV (non-flagged rows) saved to {args.filtered_csv}")
+    elif args.command == 'run':
+        main(days=args.days, incremental=args.incremental, state_file=args.state_file, overlap_days=args.overlap_days)
+    else:
+        main()
+    return 0
 
 if __name__ == '__main__':
-    main()
+    sys.exit(cli())
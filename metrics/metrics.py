@@ -0,0 +1,302 @@
+"""
+Lightweight timing and counter instrumentation for the scrape/OCR pipeline.
+
+Disabled by default: timer() hands back a shared no-op context manager and incr() returns
+immediately, so instrumented code costs one flag check per call. Enable it with configure().
+
+    from metrics import metrics
+
+    metrics.configure(spans_file='out/metrics/spans.jsonl')
+    metrics.start_case('1234567', county='harris')
+    with metrics.timer('ocr.rasterize'):
+        ...
+    metrics.incr('llm.retries')
+    metrics.end_case()
+    metrics.report()
+
+Each finished case is written to the spans file as one JSON line holding its timed spans
+and counters. Timers that run outside a case (login, search, ...) are written as their
+own lines. report() prints aggregate histograms for every timer name.
+
+Work done for a case in another process (e.g. OCR in a worker pool) is collected there
+with start_case()/detach_case() and merged back with hold_case()/release_case(), so the
+case line covers the whole case and the worker's timers still reach the histograms.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+# Upper bounds (seconds) of the histogram buckets; the last bucket is open-ended
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+enabled = False
+spans_file_path = None
+histograms = {}
+counters = {}
+# Re-entrant: release_case() merges worker spans into histograms while holding it
+_lock = threading.RLock()
+_local = threading.local()
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, fraction):
+        """
+        Upper bound of the bucket holding the given percentile (max for the open-ended bucket).
+        """
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= target:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_s': self.total,
+            'mean_s': self.total / self.count if self.count else None,
+            'min_s': self.min,
+            'max_s': self.max,
+            'p50_s': self.percentile(0.5),
+            'p90_s': self.percentile(0.9),
+            'p99_s': self.percentile(0.99),
+            'buckets': dict(zip([str(b) for b in BUCKETS] + ['inf'], self.buckets)),
+        }
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _Timer:
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.wall_start = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        _record_span(self.name, self.wall_start, duration, exc_type, self.attrs)
+        return False
+
+def configure(spans_file=None, enable=True):
+    """
+    Turns instrumentation on (or off) and resets all collected metrics.
+
+    Args:
+        spans_file (str | None): JSONL file that per-case spans are appended to. Spans are
+            only aggregated into histograms if None.
+        enable (bool): Pass False to turn instrumentation back off.
+    """
+    global enabled
+    global spans_file_path
+    with _lock:
+        histograms.clear()
+        counters.clear()
+    _local.__dict__.clear()
+    if spans_file:
+        os.makedirs(os.path.dirname(spans_file) or '.', exist_ok=True)
+    spans_file_path = spans_file
+    enabled = enable
+
+def timer(name, **attrs):
+    """
+    Context manager that times the enclosed block under the given name.
+    """
+    if not enabled:
+        return _NULL_TIMER
+    return _Timer(name, attrs)
+
+def incr(name, amount=1):
+    """
+    Adds to a counter, both run-wide and on the current case (if any).
+    """
+    if not enabled:
+        return
+    with _lock:
+        counters[name] = counters.get(name, 0) + amount
+    case = getattr(_local, 'case', None)
+    if case is not None:
+        case['counters'][name] = case['counters'].get(name, 0) + amount
+
+def start_case(case_id, **attrs):
+    """
+    Starts collecting spans and counters for one case on the current thread.
+    """
+    if not enabled:
+        return
+    _local.case = {
+        'case': case_id,
+        'start': datetime.now().isoformat(timespec='milliseconds'),
+        'perf_start': time.perf_counter(),
+        'spans': [],
+        'counters': {},
+        **attrs,
+    }
+
+def end_case(**attrs):
+    """
+    Finishes the current case and writes it to the spans file.
+    If the case is held (see hold_case), it is written once the last hold is released.
+    """
+    if not enabled:
+        return
+    case = getattr(_local, 'case', None)
+    if case is None:
+        return
+    _local.case = None
+    with _lock:
+        case.update(attrs)
+        if case.get('holds'):
+            case['ended'] = True
+            return
+    _finish_case(case)
+
+def hold_case():
+    """
+    Keeps the current case open past end_case() until release_case() is called, e.g. while
+    its PDF is still being OCR'd elsewhere. Returns the handle to pass to release_case().
+    """
+    if not enabled:
+        return None
+    case = getattr(_local, 'case', None)
+    if case is None:
+        return None
+    with _lock:
+        case['holds'] = case.get('holds', 0) + 1
+    return case
+
+def release_case(case, worker_case=None, **attrs):
+    """
+    Releases a hold from hold_case(), merging in the spans and counters a worker process
+    collected for the case (see detach_case). Writes the case if it has already ended.
+    """
+    if case is None:
+        return
+    with _lock:
+        if worker_case:
+            _merge_worker_case(case, worker_case)
+        case.update(attrs)
+        case['holds'] -= 1
+        finished = not case['holds'] and case.get('ended')
+    if finished:
+        _finish_case(case)
+
+def detach_case():
+    """
+    Ends the current case without writing it and returns it as a plain dict, so a worker
+    process can send it back to the process that owns the case.
+    """
+    if not enabled:
+        return None
+    case = getattr(_local, 'case', None)
+    if case is None:
+        return None
+    _local.case = None
+    case['duration_s'] = time.perf_counter() - case.pop('perf_start')
+    return case
+
+def _merge_worker_case(case, worker_case):
+    # Worker offsets are relative to the worker's own start; shift them onto the case
+    shift = (datetime.fromisoformat(worker_case['start']) - datetime.fromisoformat(case['start'])).total_seconds()
+    for span in worker_case['spans']:
+        _add_to_histogram(span['name'], span['duration_s'])
+        case['spans'].append({**span, 'offset_s': span.get('offset_s', 0.0) + shift, 'worker': True})
+    for name, amount in worker_case['counters'].items():
+        counters[name] = counters.get(name, 0) + amount
+        case['counters'][name] = case['counters'].get(name, 0) + amount
+
+def _finish_case(case):
+    case.pop('holds', None)
+    case.pop('ended', None)
+    case['duration_s'] = time.perf_counter() - case.pop('perf_start')
+    _add_to_histogram('case', case['duration_s'])
+    _write_line(case)
+
+def _add_to_histogram(name, duration):
+    with _lock:
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram()
+        histogram.add(duration)
+
+def _record_span(name, wall_start, duration, exc_type, attrs):
+    _add_to_histogram(name, duration)
+    span = {'name': name, 'duration_s': duration}
+    if exc_type is not None:
+        span['error'] = exc_type.__name__
+    span.update(attrs)
+
+    case = getattr(_local, 'case', None)
+    if case is not None:
+        span['offset_s'] = time.perf_counter() - duration - case['perf_start']
+        case['spans'].append(span)
+    else:
+        span['start'] = datetime.fromtimestamp(wall_start).isoformat(timespec='milliseconds')
+        _write_line({'span': span})
+
+def _write_line(record):
+    if not spans_file_path:
+        return
+    line = json.dumps(record, default=str)
+    with _lock:
+        with open(spans_file_path, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
+
+def summary():
+    """
+    Returns the aggregate histograms and counters collected so far.
+    """
+    with _lock:
+        return {
+            'timers': {name: histogram.to_dict() for name, histogram in sorted(histograms.items())},
+            'counters': dict(sorted(counters.items())),
+        }
+
+def report(summary_file=None):
+    """
+    Prints the aggregate histograms and counters, and optionally writes them to a JSON file.
+    """
+    if not enabled:
+        return None
+    data = summary()
+    print(f"{'timer':<24}{'count':>8}{'total':>10}{'mean':>9}{'p50':>9}{'p90':>9}{'max':>9}")
+    for name, stats in data['timers'].items():
+        print(f"{name:<24}{stats['count']:>8}{stats['total_s']:>9.2f}s{stats['mean_s']:>8.2f}s"
+              f"{stats['p50_s']:>8.2f}s{stats['p90_s']:>8.2f}s{stats['max_s']:>8.2f}s")
+    for name, value in data['counters'].items():
+        print(f"{name:<24}{value:>8}")
+    if summary_file:
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+    return data
@@ -0,0 +1,175 @@
+"""
+Batch OCR/extraction over PDFs that are already on disk (no browser needed).
+
+Takes a directory of PDFs or a manifest (one PDF path per line), processes them with a
+pool of worker processes and writes one JSON result per PDF into the output directory.
+Source PDFs are never deleted, and PDFs that already have a result are skipped, so an
+interrupted backfill can simply be re-run.
+
+Run it through main.py:
+    python main.py batch-ocr archive/petitions --out-dir out/batch --workers 4
+    python main.py batch-ocr manifest.txt --out-dir out/batch --retry-errors
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from ocr import ocr
+
+def collect_pdfs(source, recursive=False):
+    """
+    Returns the PDF paths in a directory, or listed in a manifest file (one path per line,
+    relative paths are resolved against the manifest's directory; blank lines and # comments are ignored).
+    """
+    if os.path.isdir(source):
+        pdfs = []
+        for root, dirs, files in os.walk(source):
+            pdfs.extend(os.path.join(root, f) for f in files if f.lower().endswith('.pdf'))
+            if not recursive:
+                break
+        return sorted(pdfs)
+
+    manifest_dir = os.path.dirname(os.path.abspath(source))
+    pdfs = []
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            pdfs.append(line if os.path.isabs(line) else os.path.join(manifest_dir, line))
+    return pdfs
+
+def result_paths(pdfs, source, out_dir):
+    """
+    Maps each PDF to its result file in out_dir: the PDF's path relative to the source
+    directory (or the manifest's directory) flattened into one name, e.g.
+    2024/03/foo.pdf -> 2024__03__foo.json. PDFs outside that directory use their absolute path.
+    The name depends only on the PDF itself, so it does not change when later runs add other PDFs.
+    """
+    base_dir = os.path.abspath(source if os.path.isdir(source) else os.path.dirname(os.path.abspath(source)))
+    paths = {}
+    for pdf_path in pdfs:
+        abs_path = os.path.abspath(pdf_path)
+        rel_path = os.path.relpath(abs_path, base_dir)
+        if rel_path.startswith(os.pardir):
+            rel_path = abs_path.lstrip(os.sep)
+        stem = os.path.splitext(rel_path)[0].replace(os.sep, '__')
+        paths[pdf_path] = os.path.join(out_dir, f"{stem}.json")
+    return paths
+
+def already_processed(result_path, retry_errors=False):
+    if not os.path.exists(result_path):
+        return False
+    if not retry_errors:
+        return True
+    try:
+        with open(result_path, 'r', encoding='utf-8') as f:
+            return not json.load(f).get('error')
+    except (OSError, ValueError):
+        return False
+
+def write_result(result_path, result):
+    # Write to a temp file first so an interrupted run never leaves a half-written result behind
+    tmp_path = f"{result_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+    os.replace(tmp_path, result_path)
+
+def process_pdf(pdf_path, result_path):
+    """
+    OCRs one PDF, extracts the damages and court, and writes the JSON result.
+    The PDF itself is left in place.
+    """
+    from pdf2image import pdfinfo_from_path
+
+    start = time.perf_counter()
+    result = {
+        'pdf': os.path.abspath(pdf_path),
+        'pages': 0,
+        'damages': None,
+        'court_name': None,
+        'dollar_amount': None,
+        'court_number': None,
+        'result': None,
+        'error': None,
+    }
+    try:
+        result['pages'] = pdfinfo_from_path(pdf_path)['Pages']
+        extracted_text = ocr.extract_text_from_pdf_with_watermark_removal(pdf_path)
+        damages = ocr.extract_damages_with_gemini(extracted_text)
+        court_name = ocr.extract_court_names_with_gemini(extracted_text)
+
+        result['damages'] = damages.strip('"')
+        result['court_name'] = court_name.strip('" ')
+        result['dollar_amount'] = ocr.find_dollar_amount(damages)
+        result['court_number'] = ocr.find_court_number(court_name)
+        # Same format process_pdf_and_find_damages returns to the scraper
+        result['result'] = f'{damages}, {court_name}'
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    result['elapsed_s'] = time.perf_counter() - start
+    result['processed_at'] = datetime.now().isoformat(timespec='seconds')
+    write_result(result_path, result)
+    return result
+
+def run_batch(source, out_dir, workers=1, recursive=False, retry_errors=False, limit=None):
+    """
+    Processes every PDF from a directory or manifest that does not have a result yet.
+
+    Args:
+        source (str): Directory of PDFs or manifest file.
+        out_dir (str): Directory the JSON results are written to.
+        workers (int): Number of worker processes.
+        recursive (bool): Also look in subdirectories when source is a directory.
+        retry_errors (bool): Re-process PDFs whose existing result recorded an error.
+        limit (int | None): Process at most this many PDFs (after skipping).
+
+    Returns:
+        dict: Counts and throughput for the run.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    pdfs = collect_pdfs(source, recursive)
+    paths = result_paths(pdfs, source, out_dir)
+
+    todo = [pdf_path for pdf_path in pdfs if not already_processed(paths[pdf_path], retry_errors)]
+    skipped = len(pdfs) - len(todo)
+    if limit is not None:
+        todo = todo[:limit]
+    print(f"{len(pdfs)} PDFs found, {skipped} already processed, {len(todo)} to process with {workers} worker(s).")
+
+    done = failed = pages = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_pdf, pdf_path, paths[pdf_path]): pdf_path for pdf_path in todo}
+        for future in as_completed(futures):
+            pdf_path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. out of memory); no result file was written
+                result = {'error': f"{type(e).__name__}: {e}", 'pages': 0}
+            done += 1
+            pages += result['pages']
+            if result['error']:
+                failed += 1
+                print(f"[{done}/{len(todo)}] FAILED {pdf_path}: {result['error']}")
+            else:
+                print(f"[{done}/{len(todo)}] {pdf_path}: {result['dollar_amount']}, court {result['court_number']}")
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        'found': len(pdfs),
+        'skipped': skipped,
+        'processed': done,
+        'failed': failed,
+        'pages': pages,
+        'elapsed_s': elapsed,
+        'files_per_minute': done / (elapsed / 60) if elapsed else 0.0,
+        'pages_per_second': pages / elapsed if elapsed else 0.0,
+    }
+    print(f"Processed {done} PDFs ({failed} failed, {skipped} skipped) in {elapsed:.1f}s: "
+          f"{summary['files_per_minute']:.1f} files/min, {summary['pages_per_second']:.2f} pages/s")
+    return summary
@@ -1,15 +1,12 @@
 import os
 import re
-import numpy as np
-from PyPDF2 import PdfReader
-from pdf2image import convert_from_path
-import pytesseract
-from PIL import Image
-import cv2
-import google.generativeai as genai
-from dotenv import load_dotenv
+import string
 import time
 import functools
+from metrics import metrics
+
+# numpy, cv2, PIL, pdf2image, pytesseract and google.generativeai are imported inside the
+# functions that use them, so importing this module (e.g. from main.py) stays fast.
 
 def retry_on_429(max_retries=3, wait_seconds=60):
     def decorator_retry(func):
@@ -23,29 +20,73 @@ def retry_on_429(max_retries=3, wait_seconds=60):
                     retries += 1
                     print(f'{e} retrying {retries}')
                     if retries < max_retries:
+                        metrics.incr('llm.retries')
                         print(f"429 error encountered. Retrying in {wait_seconds} seconds... (Attempt {retries}/{max_retries})")
                         time.sleep(wait_seconds)
                     else:
+                        metrics.incr('llm.failures')
                         print("Max retries reached. Raising exception.")
                         raise
         return wrapper_retry
     return decorator_retry
 
-genai.configure()
-load_dotenv()
-google_api_key = os.getenv("GOOGLE_API_KEY")
 # upper_limit = 66586
 upper_limit = 66586//4
 
-@retry_on_429(max_retries=3, wait_seconds=60)
-def extract_damages_with_gemini(text):
+# Optional replacement for the Gemini call (see set_llm_backend)
+llm_backend = None
+
+def set_llm_backend(backend):
+    """
+    Replaces the function used to send prompts to the LLM, e.g. with a recorded
+    or stubbed backend so extraction can run offline and reproducibly.
+
+    Args:
+        backend (callable | None): Takes the prompt string and returns the response text.
+            Pass None to go back to calling Gemini.
+    """
+    global llm_backend
+    llm_backend = backend
+
+_genai = None
+
+def get_genai():
+    """
+    Imports and configures the Gemini client on first use (reads GOOGLE_API_KEY from the .env file).
+    """
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+        _genai = genai
+    return _genai
+
+def generate_with_gemini(prompt):
     # Configure the Gemini API client
-    genai.configure(api_key=google_api_key)
+    genai = get_genai()
 
     # Initialize the GenerativeModel with the specified model name
     # model = genai.GenerativeModel(model_name="gemini-1.5-flash")
     model = genai.GenerativeModel(model_name="gemini-2.0-flash")
     print(model.model_name)
+
+    # Generate a response using the Gemini model
+    response = model.generate_content(prompt)
+    return response.text
+
+def generate_content(prompt):
+    """
+    Sends the prompt to the configured LLM backend (Gemini by default) and returns the response text.
+    """
+    if llm_backend is not None:
+        return llm_backend(prompt)
+    return generate_with_gemini(prompt)
+
+@retry_on_429(max_retries=3, wait_seconds=60)
+def extract_damages_with_gemini(text):
     if len(text) > upper_limit:
         text = text[:upper_limit]
 
@@ -62,11 +103,12 @@ def extract_damages_with_gemini(text):
         f"Text:\n{text}"
     )
 
-    # Generate a response using the Gemini model
-    response = model.generate_content(prompt)
+    # Generate a response using the LLM backend
+    with metrics.timer('llm.damages'):
+        response_text = generate_content(prompt)
 
     # Extract and return the model's output
-    text = response.text.replace('"', '')
+    text = response_text.replace('"', '')
     text = text.replace('\n', ' ')
     # print('text:', text)
 
@@ -75,12 +117,6 @@ def extract_damages_with_gemini(text):
 #91% pass rate all wrong answers flagged
 @retry_on_429(max_retries=3, wait_seconds=60)
 def extract_court_names_with_gemini(text):
-    # Configure the Gemini API client
-    genai.configure(api_key=google_api_key)
-
-    # Initialize the GenerativeModel with the specified model name
-    # model = genai.GenerativeModel(model_name="gemini-1.5-flash")
-    model = genai.GenerativeModel(model_name="gemini-2.0-flash")
     if len(text) > upper_limit:
         text = text[:upper_limit]
 
@@ -97,11 +133,12 @@ def extract_court_names_with_gemini(text):
     )
 
 
-    # Generate a response using the Gemini model
-    response = model.generate_content(prompt)
+    # Generate a response using the LLM backend
+    with metrics.timer('llm.court'):
+        response_text = generate_content(prompt)
 
     # Extract and return the model's output
-    text = response.text.replace('"', '')
+    text = response_text.replace('"', '')
     text = text.replace('\n', ' ')
 
     return f'\"{text.strip()} \"'
@@ -112,6 +149,10 @@ def preprocess_image_to_remove_watermark(image, output_folder, page_number):
     apply thresholding, and then make the text bolder with morphological dilation.
     Further darken the text to enhance visibility for OCR.
     """
+    import cv2
+    import numpy as np
+    from PIL import Image
+
     # Convert PIL Image to OpenCV format (grayscale)
     img = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2GRAY)
 
@@ -138,6 +179,24 @@ def preprocess_image_to_remove_watermark(image, output_folder, page_number):
 
     return processed_pil
 
+def rasterize_pdf(pdf_path, dpi=300):
+    """
+    Converts every page of the PDF into a PIL image.
+    """
+    from pdf2image import convert_from_path
+
+    with metrics.timer('ocr.rasterize'):
+        return convert_from_path(pdf_path, dpi=dpi)
+
+def ocr_image(image):
+    """
+    Runs Tesseract OCR on a (preprocessed) page image and returns the text.
+    """
+    import pytesseract
+
+    with metrics.timer('ocr.tesseract'):
+        return pytesseract.image_to_string(image)
+
 def extract_text_from_pdf_with_watermark_removal(pdf_path, output_folder="processed_images"):
     """
     Extracts text from a PDF by converting pages to images, removing watermarks,
@@ -147,17 +206,19 @@ def extract_text_from_pdf_with_watermark_removal(pdf_path, output_folder="proces
     # If you want the processed images to be saved, uncomment this:
     # os.makedirs(output_folder, exist_ok=True)
 
-    pages = convert_from_path(pdf_path, dpi=300)
+    pages = rasterize_pdf(pdf_path, dpi=300)
     text = ""
 
+    metrics.incr('ocr.pages', len(pages))
     for page_number, page_image in enumerate(pages, start=1):
         print(f"Processing page {page_number}...")
 
         # Preprocess (threshold, remove watermark noise, make text bolder)
-        processed_image = preprocess_image_to_remove_watermark(page_image, output_folder, page_number)
+        with metrics.timer('ocr.preprocess'):
+            processed_image = preprocess_image_to_remove_watermark(page_image, output_folder, page_number)
 
         # Perform OCR on the preprocessed image
-        page_text = pytesseract.image_to_string(processed_image)
+        page_text = ocr_image(processed_image)
         text += page_text + "\n\n"
 
     # Save the extracted text to a file (COMMENTED OUT by default)
@@ -188,6 +249,26 @@ def find_damages_and_value(text):
 
     return "No sentence found where 'damages' is followed by a dollar value."
 
+def find_dollar_amount(text):
+    """
+    Returns the first token starting with '$' (trailing punctuation stripped), the same way
+    convert_txt_to_csv builds the DOLLAR_AMOUNT column, or "No dollar amount found."
+    """
+    for word in text.split():
+        if word.startswith('$'):
+            return word.rstrip(string.punctuation)
+    return "No dollar amount found."
+
+def find_court_number(text):
+    """
+    Returns the court number from a 'Harris County - County Civil Court at Law No. [n]' response.
+    """
+    match = re.search(r'No\.\s*(-?\d+)', text)
+    if match:
+        return match.group(1)
+    parts = text.strip().strip('"').split(' ')
+    return parts[-1] if parts else ""
+
 def process_pdf_and_find_damages(pdf_path,delete_pdf = True):
     """
     Main function to process the PDF, extract text, and find damages with values.
@@ -0,0 +1,125 @@
+import importlib
+import os
+from abc import ABC, abstractmethod
+import shutil
+import time
+import threading
+
+# -----------------------
+# Scraper registry
+# -----------------------
+# County name -> dotted path of its CountyScraper subclass. Classes are imported only when a
+# county is actually crawled, so listing counties does not load selenium.
+SCRAPER_CLASSES = {
+    'harris': 'scrape.harris.harris_county_scraper.HarrisCountyScraper',
+}
+
+def load_scraper_class(county):
+    """
+    Returns the CountyScraper subclass registered for the county.
+    """
+    if county not in SCRAPER_CLASSES:
+        raise ValueError(f"No scraper registered for county '{county}'. Available: {', '.join(sorted(SCRAPER_CLASSES))}")
+    module_name, class_name = SCRAPER_CLASSES[county].rsplit('.', 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+# -----------------------
+# RateLimiter Class
+# -----------------------
+class RateLimiter:
+    """
+    Spaces out requests to one site so there are at most `requests_per_minute` of them.
+    Thread-safe; a limiter with no limit never waits.
+    """
+    def __init__(self, requests_per_minute=None):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.next_allowed = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_allowed - now
+            self.next_allowed = max(now, self.next_allowed) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+# -----------------------
+# CountyScraper Class
+# -----------------------
+class CountyScraper(ABC):
+    """
+    Interface every county scraper implements, following the HarrisCountyScraper lifecycle:
+
+        scraper.login()
+        scraper.search_cases(days=7)          # or from_date=... for incremental runs
+        scraper.scrape_cases(crawl_state=None)
+        scraper.quit()
+
+    Subclasses set `county` and call throttle() before every request to the court site.
+    When run by the CrawlScheduler, rate_limiter and extraction_pipeline are set: downloaded
+    PDFs are then handed to submit_for_extraction() instead of being OCR'd inline.
+    A subclass that leaves any of the lifecycle methods out cannot be instantiated.
+    """
+    county = None
+
+    def __init__(self, username, password, download_dir, output_file):
+        self.username = username
+        self.password = password
+        self.download_dir = download_dir
+        self.output_file = output_file
+        self.rate_limiter = None
+        self.extraction_pipeline = None
+
+    @abstractmethod
+    def login(self):
+        ...
+
+    @abstractmethod
+    def search_cases(self, days=7, from_date=None):
+        ...
+
+    @abstractmethod
+    def scrape_cases(self, crawl_state=None):
+        ...
+
+    @abstractmethod
+    def quit(self):
+        ...
+
+    def throttle(self):
+        """
+        Waits for this site's rate limiter (if any) before the next request.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait()
+
+    def submit_for_extraction(self, case_number, row, pdf_path, crawl_state=None):
+        """
+        Moves a downloaded PDF out of the download directory and queues it on the shared
+        extraction pipeline, which OCRs it and writes `row` plus the result to output_file.
+        The case is marked processed in crawl_state only after that row is written.
+        """
+        pending_dir = f"{self.download_dir.rstrip(os.sep)}_pending"
+        os.makedirs(pending_dir, exist_ok=True)
+        pending_path = os.path.join(pending_dir, f"{case_number}_{os.path.basename(pdf_path)}")
+        shutil.move(pdf_path, pending_path)
+        self.extraction_pipeline.submit(self.county, case_number, self.output_file, row, pending_path, crawl_state)
+
+    def write_output_row(self, row):
+        """
+        Writes a row with nothing to OCR (e.g. the download never arrived) straight to
+        output_file through the extraction pipeline's output sink.
+        """
+        self.extraction_pipeline.sink.write(self.output_file, row)
+
+    def complete_crawl(self, crawl_state, to_date):
+        """
+        Advances the crawl state's high-water mark to to_date once the search window is
+        scraped. With a pipeline, first waits for this county's queued PDFs to be written.
+        """
+        if self.extraction_pipeline is not None:
+            self.extraction_pipeline.wait(self.county)
+        crawl_state.complete(to_date)
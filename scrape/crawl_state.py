@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+DATE_FORMAT = '%m/%d/%Y'
+
+# -----------------------
+# CrawlState Class
+# -----------------------
+class CrawlState:
+    """
+    High-water mark for incremental crawls, stored as JSON:
+
+        {
+          "last_to_date": "03/14/2025",
+          "known_cases": {"1234567": "03/14/2025", ...}
+        }
+
+    last_to_date is the end of the last search window that was fully scraped. The next
+    run searches from that date minus overlap_days (or default_days back if there is no
+    high-water mark yet), and every case number in known_cases is skipped at the results-list
+    level. Known cases processed before that search window are dropped on save so the file
+    does not grow forever; a case is always processed after it is filed, so nothing the next
+    run will list is dropped.
+
+    Thread-safe: with the CrawlScheduler, cases are also marked processed from the
+    extraction pipeline's callback threads.
+    """
+    def __init__(self, state_file, overlap_days=1, default_days=7):
+        self.state_file = state_file
+        self.overlap_days = overlap_days
+        self.default_days = default_days
+        self.last_to_date = None
+        self.known_cases = {}
+        self.lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.state_file):
+            return
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        last_to_date = data.get('last_to_date')
+        self.last_to_date = datetime.strptime(last_to_date, DATE_FORMAT) if last_to_date else None
+        self.known_cases = data.get('known_cases', {})
+
+    def save(self):
+        with self.lock:
+            self._save()
+
+    def _save(self):
+        # Prune against the window the next run will actually search
+        cutoff = self.search_from_date(default_days=self.default_days)
+        self.known_cases = {
+            case_number: seen for case_number, seen in self.known_cases.items()
+            if datetime.strptime(seen, DATE_FORMAT) >= cutoff
+        }
+        os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+        # Write to a temp file first so a crash mid-write never corrupts the state
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'last_to_date': self.last_to_date.strftime(DATE_FORMAT) if self.last_to_date else None,
+                'known_cases': self.known_cases,
+            }, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.state_file)
+
+    def search_from_date(self, default_days=None):
+        """
+        Start of the next search window: the high-water mark minus the overlap,
+        or default_days (self.default_days if None) ago if there is no high-water mark yet.
+        """
+        if default_days is None:
+            default_days = self.default_days
+        today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+        if self.last_to_date is None:
+            return today - timedelta(days=default_days)
+        return min(self.last_to_date - timedelta(days=self.overlap_days), today)
+
+    def is_known(self, case_number):
+        with self.lock:
+            return case_number in self.known_cases
+
+    def mark_processed(self, case_number):
+        """
+        Records a case as processed and saves the state right away, so an interrupted run
+        does not redo it.
+        """
+        with self.lock:
+            self.known_cases[case_number] = datetime.today().strftime(DATE_FORMAT)
+            self.save()
+
+    def complete(self, to_date):
+        """
+        Advances the high-water mark once the whole search window up to to_date has been scraped.
+        """
+        with self.lock:
+            self.last_to_date = to_date.replace(hour=0, minute=0, second=0, microsecond=0)
+            self.save()
@@ -3,10 +3,16 @@ import os
 import re
 import time
 import shutil
-import requests
+import subprocess
 from datetime import datetime, timedelta
 
-from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    ElementClickInterceptedException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -17,6 +23,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
 from ocr.ocr import process_pdf_and_find_damages
+from metrics import metrics
+from scrape.county_scraper import CountyScraper
 
 # -----------------------
 # Utility function
@@ -39,15 +47,116 @@ def append_to_last_line(file_path, text_to_append):
     with open(file_path, 'w', encoding='utf-8') as f:
         f.writelines(lines)
 
+def process_tree_rss_mb(root_pid):
+    """
+    Returns the combined resident memory (MB) of a process and all of its descendants,
+    e.g. chromedriver plus every Chrome process it started. Uses `ps`, so it works on macOS and Linux.
+    """
+    output = subprocess.run(['ps', '-A', '-o', 'pid=,ppid=,rss='], capture_output=True, text=True, check=True).stdout
+    children = {}
+    rss_kb = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) != 3 or not all(part.isdigit() for part in parts):
+            continue
+        pid, ppid, rss = (int(part) for part in parts)
+        children.setdefault(ppid, []).append(pid)
+        rss_kb[pid] = rss
+
+    total_kb = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        total_kb += rss_kb.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total_kb / 1024
+
+# -----------------------
+# Browser setup
+# -----------------------
+# 'default' is the original full, headed Chrome. 'performance' runs headless, blocks
+# non-essential resources and returns from navigation at DOMContentLoaded, relying on
+# the explicit waits in the scraper instead of full page loads.
+BROWSER_PROFILES = {
+    'default': {
+        'headless': False,
+        'block_resources': False,
+        'page_load_strategy': 'normal',
+    },
+    'performance': {
+        'headless': True,
+        'block_resources': True,
+        'page_load_strategy': 'eager',
+    },
+}
+
+# Resource types the scraper never needs (images, stylesheets, fonts, media)
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.bmp', '*.ico', '*.svg', '*.webp',
+    '*.css', '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp3', '*.mp4', '*.webm',
+]
+
+DRIVER_PATH_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'scrape_ocr_leads', 'chromedriver_path')
+_driver_path = None
+
+def get_chromedriver_path(refresh=False):
+    """
+    Returns the chromedriver path, resolving it through ChromeDriverManager only when needed.
+    CHROMEDRIVER_PATH overrides the lookup; otherwise the resolved path is cached in memory
+    and in DRIVER_PATH_CACHE_FILE so later starts skip the version check and download.
+
+    Args:
+        refresh (bool): Ignore the cache and resolve the driver again (e.g. after a Chrome update).
+    """
+    global _driver_path
+    env_path = os.getenv('CHROMEDRIVER_PATH')
+    if env_path:
+        if refresh:
+            raise RuntimeError(f"Chrome failed to start with CHROMEDRIVER_PATH={env_path}. "
+                               f"Point it at a chromedriver matching the installed Chrome, or unset it.")
+        return env_path
+
+    if not refresh:
+        if _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+        if os.path.exists(DRIVER_PATH_CACHE_FILE):
+            with open(DRIVER_PATH_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cached_path = f.read().strip()
+            if cached_path and os.path.exists(cached_path):
+                _driver_path = cached_path
+                return _driver_path
+
+    _driver_path = ChromeDriverManager().install()
+    try:
+        os.makedirs(os.path.dirname(DRIVER_PATH_CACHE_FILE), exist_ok=True)
+        with open(DRIVER_PATH_CACHE_FILE, 'w', encoding='utf-8') as f:
+            f.write(_driver_path)
+    except OSError as e:
+        print(f"Could not cache chromedriver path: {e}")
+    return _driver_path
+
 # -----------------------
 # HarrisCountyScraper Class
 # -----------------------
-class HarrisCountyScraper:
-    def __init__(self, username, password, download_dir, output_file):
-        self.username = username
-        self.password = password
-        self.download_dir = download_dir
-        self.output_file = output_file
+BASE_URL = 'https://www.cclerk.hctx.net'
+RESULTS_CONTAINER_ID = 'ctl00_ContentPlaceHolder1_ListViewCases_itemContainer'
+
+class HarrisCountyScraper(CountyScraper):
+    county = 'harris'
+
+    def __init__(self, username, password, download_dir, output_file, base_url=BASE_URL, browser_profile='default',
+                 recycle_after_cases=None, max_browser_rss_mb=None):
+        if browser_profile not in BROWSER_PROFILES:
+            raise ValueError(f"Unknown browser profile '{browser_profile}'. Choose from: {', '.join(BROWSER_PROFILES)}")
+
+        super().__init__(username, password, download_dir, output_file)
+        # Override to point the scraper at a stand-in site (see bench/court_site_server.py)
+        self.base_url = base_url.rstrip('/')
+        self.browser_profile = browser_profile
+        # Search window of the last search_cases call
+        self.search_from = None
+        self.search_to = None
         self.driver = None
         self.wait = None
 
@@ -55,6 +164,33 @@ class HarrisCountyScraper:
         os.makedirs(self.download_dir, exist_ok=True)
         os.makedirs(os.path.dirname(self.output_file), exist_ok=True)
 
+        self.driver = self.start_browser()
+        self.wait = WebDriverWait(self.driver, 10)
+
+        # Configurable wait variables for downloads
+        self.download_wait_timeout = 300  # seconds
+        self.download_poll_interval = 5   # seconds
+        self.download_check_interval = 0.25  # seconds between checks for a finished download
+
+        # Long-run mode: restart Chrome (and log in again) after this many cases, or once
+        # Chrome uses more than this much memory. None disables the check.
+        self.recycle_after_cases = recycle_after_cases
+        self.max_browser_rss_mb = max_browser_rss_mb
+        self.cases_since_recycle = 0
+        self.rss_check_due = False
+
+        # Cases are opened in their own tab; the results stay loaded in this one
+        self.results_handle = None
+        self.current_page = 1
+        # A case that fails this many times is skipped for the rest of the run
+        self.max_case_attempts = 3
+
+    def start_browser(self):
+        """
+        Starts Chrome configured for PDF downloads and the selected browser profile.
+        """
+        profile = BROWSER_PROFILES[self.browser_profile]
+
         # Configure Chrome options
         chrome_options = webdriver.ChromeOptions()
         prefs = {
@@ -64,13 +200,60 @@ class HarrisCountyScraper:
             'download.directory_upgrade': True,
             'safebrowsing.enabled': True,
         }
+        if profile['block_resources']:
+            prefs['profile.managed_default_content_settings.images'] = 2
         chrome_options.add_experimental_option('prefs', prefs)
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-        self.wait = WebDriverWait(self.driver, 10)
+        chrome_options.page_load_strategy = profile['page_load_strategy']
+        if profile['headless']:
+            chrome_options.add_argument('--headless=new')
+            chrome_options.add_argument('--window-size=1920,1080')
+            chrome_options.add_argument('--disable-gpu')
+            chrome_options.add_argument('--disable-extensions')
+            chrome_options.add_argument('--disable-dev-shm-usage')
 
-        # Configurable wait variables for downloads
-        self.download_wait_timeout = 300  # seconds
-        self.download_poll_interval = 5   # seconds
+        try:
+            driver = webdriver.Chrome(service=Service(get_chromedriver_path()), options=chrome_options)
+        except WebDriverException as e:
+            # A cached driver no longer matches the installed Chrome; resolve it again.
+            # Resolving again cannot help when CHROMEDRIVER_PATH pins the driver.
+            if os.getenv('CHROMEDRIVER_PATH'):
+                raise
+            print(f"Starting Chrome with the cached driver failed ({e.msg}). Resolving chromedriver again...")
+            driver = webdriver.Chrome(service=Service(get_chromedriver_path(refresh=True)), options=chrome_options)
+
+        if profile['headless']:
+            # Make sure headless Chrome saves downloads to the download directory, from every tab
+            driver.execute_cdp_cmd('Browser.setDownloadBehavior', {'behavior': 'allow', 'downloadPath': self.download_dir})
+        self.apply_tab_settings(driver)
+        return driver
+
+    def apply_tab_settings(self, driver):
+        """
+        Applies the per-tab CDP settings of the browser profile (resource blocking) to the
+        current tab. Network.* commands only affect the tab they are sent to, so this runs
+        for the first tab and again for every tab open_case() opens.
+        """
+        if BROWSER_PROFILES[self.browser_profile]['block_resources']:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+
+    def wait_for_download(self, timeout=None):
+        """
+        Polls the download directory until a PDF is there and Chrome has no download
+        in progress (no .crdownload files). Returns the PDF paths, empty on timeout.
+        """
+        if timeout is None:
+            timeout = self.download_wait_timeout
+
+        start_time = time.time()
+        while True:
+            pdf_files = glob.glob(os.path.join(self.download_dir, "*.pdf"))
+            in_progress = glob.glob(os.path.join(self.download_dir, "*.crdownload"))
+            if pdf_files and not in_progress:
+                return pdf_files
+            if time.time() - start_time >= timeout:
+                return pdf_files
+            time.sleep(self.download_check_interval)
 
     def wait_until_download_dir_empty(self, timeout=None, poll_interval=None):
         """
@@ -105,8 +288,13 @@ class HarrisCountyScraper:
         return True
 
     def login(self):
+        with metrics.timer('scrape.login'):
+            self._login()
+
+    def _login(self):
+        self.throttle()
         self.driver.get(
-            'https://www.cclerk.hctx.net/Applications/WebSearch/Registration/Login.aspx?ReturnUrl=%2fApplications%2fWebSearch%2fCourtSearch.aspx%3fCaseType%3dCivil'
+            f'{self.base_url}/Applications/WebSearch/Registration/Login.aspx?ReturnUrl=%2fApplications%2fWebSearch%2fCourtSearch.aspx%3fCaseType%3dCivil'
         )
         username_field = self.wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_Login1_UserName')))
         password_field = self.driver.find_element(By.ID, 'ctl00_ContentPlaceHolder1_Login1_Password')
@@ -116,20 +304,182 @@ class HarrisCountyScraper:
         password_field.send_keys(Keys.RETURN)
         self.wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_txtFrom')))
 
-    def search_cases(self, days=7):
-        today = datetime.today()
-        past_date = today - timedelta(days=days)
+    def search_cases(self, days=7, from_date=None):
+        """
+        Searches for cases filed from `days` ago (or from `from_date`, if given) through today.
+        """
+        with metrics.timer('scrape.search', days=days):
+            self._search_cases(days, from_date)
+
+    def _search_cases(self, days, from_date=None, to_date=None):
+        today = to_date if to_date is not None else datetime.today()
+        past_date = from_date if from_date is not None else today - timedelta(days=days)
+        self.search_from = past_date
+        self.search_to = today
         from_date_str = past_date.strftime('%m/%d/%Y')
         today_str = today.strftime('%m/%d/%Y')
 
         from_date_field = self.driver.find_element(By.ID, 'ctl00_ContentPlaceHolder1_txtFrom')
         to_date_field = self.driver.find_element(By.ID, 'ctl00_ContentPlaceHolder1_txtTo')
+        from_date_field.clear()
         from_date_field.send_keys(from_date_str)
+        to_date_field.clear()
         to_date_field.send_keys(today_str)
 
         search_button = self.driver.find_element(By.ID, 'ctl00_ContentPlaceHolder1_btnSearchCase')
+        self.throttle()
         search_button.click()
-        self.wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_ListViewCases_itemContainer')))
+        self.wait.until(EC.presence_of_element_located((By.ID, RESULTS_CONTAINER_ID)))
+        self.results_handle = self.driver.current_window_handle
+        self.current_page = 1
+
+    def results_page_loaded(self):
+        """
+        Cheap check for the search results container (no page_source serialization).
+        """
+        return bool(self.driver.find_elements(By.ID, RESULTS_CONTAINER_ID))
+
+    def go_to_next_page(self):
+        """
+        Clicks the results 'Next' link and waits for the next page to replace the current one.
+        """
+        with metrics.timer('scrape.next_page'):
+            current_results = self.driver.find_element(By.ID, RESULTS_CONTAINER_ID)
+            next_button = self.driver.find_element(By.XPATH, "//a[text()='Next']")
+            self.throttle()
+            next_button.click()
+            # Wait for the current results to be replaced, then for the next page's element.
+            # Without this the wait can return on the old page (e.g. with the 'eager' page load strategy).
+            self.wait.until(EC.staleness_of(current_results))
+            self.wait.until(EC.presence_of_element_located((By.ID, RESULTS_CONTAINER_ID)))
+        self.current_page += 1
+        metrics.incr('scrape.pages')
+
+    def open_case(self, case_link):
+        """
+        Opens a case from the results list in its own tab, so the results page (an ASP.NET
+        postback that cannot be reloaded from its URL) stays loaded in the results tab.
+        Falls back to clicking the link in place if it is a postback itself.
+        """
+        href = case_link.get_attribute('href')
+        self.throttle()
+        if href and not href.lower().startswith('javascript:'):
+            self.driver.switch_to.new_window('tab')
+            self.apply_tab_settings(self.driver)
+            self.driver.get(href)
+        else:
+            case_link.click()
+        self.wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_gridViewEvents')))
+
+    def close_case_tabs(self):
+        """
+        Closes every tab except the results tab and switches back to it.
+        """
+        for handle in self.driver.window_handles:
+            if handle != self.results_handle:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+        self.driver.switch_to.window(self.results_handle)
+
+    def return_to_results(self):
+        """
+        Gets back to the current results page, cheapest way first:
+        1. Close the case tab; the results tab was never navigated away from.
+        2. If the case was opened in the results tab, step back through history.
+        3. Only if both fail, re-run the search and page forward to current_page.
+        """
+        if self.driver.current_window_handle == self.results_handle and self.results_page_loaded():
+            return
+        with metrics.timer('scrape.back_to_results'):
+            if self.results_handle in self.driver.window_handles:
+                self.close_case_tabs()
+                if self.results_page_loaded():
+                    return
+                for _ in range(3):
+                    self.throttle()
+                    self.driver.back()
+                    if self.results_page_loaded():
+                        return
+            else:
+                self.driver.switch_to.window(self.driver.window_handles[0])
+
+            page = self.current_page
+            print(f'Results page lost; searching again and paging to page {page}...')
+            metrics.incr('scrape.research')
+            if not self.driver.find_elements(By.ID, 'ctl00_ContentPlaceHolder1_txtFrom'):
+                self.throttle()
+                self.driver.get(f'{self.base_url}/Applications/WebSearch/CourtSearch.aspx?CaseType=Civil')
+                self.wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_txtFrom')))
+            self._search_cases(0, from_date=self.search_from, to_date=self.search_to)
+            while self.current_page < page:
+                self.go_to_next_page()
+
+    def recover_results_page(self):
+        """
+        return_to_results() after a failed case; recycles the browser if even that fails.
+        """
+        try:
+            self.return_to_results()
+        except (TimeoutException, WebDriverException) as nav_err:
+            # The browser is stuck or gone; start a fresh one and log in again
+            print(f"Could not return to the results page ({nav_err}); recycling the browser.")
+            self.recycle_browser()
+
+    def record_case_failure(self, case_number, failed_attempts, processed_cases):
+        """
+        Counts a failed attempt at a case and, after max_case_attempts, skips it for the rest
+        of the run. It is not recorded in the crawl state, so the next incremental run retries it.
+        """
+        failed_attempts[case_number] = failed_attempts.get(case_number, 0) + 1
+        if failed_attempts[case_number] >= self.max_case_attempts:
+            print(f"Giving up on case {case_number} after {failed_attempts[case_number]} failed attempts.")
+            metrics.incr('scrape.cases_abandoned')
+            processed_cases.add(case_number)
+
+    def browser_rss_mb(self):
+        """
+        Memory used by chromedriver and all Chrome processes, in MB (None if it cannot be measured).
+        """
+        try:
+            return process_tree_rss_mb(self.driver.service.process.pid)
+        except Exception as e:
+            print(f"Could not measure browser memory: {e}")
+            return None
+
+    def needs_recycle(self):
+        if self.recycle_after_cases and self.cases_since_recycle >= self.recycle_after_cases:
+            print(f"Recycling browser after {self.cases_since_recycle} cases.")
+            return True
+        # Measuring memory runs `ps`, so only do it once per opened case, not on every loop pass
+        if self.max_browser_rss_mb and self.rss_check_due:
+            self.rss_check_due = False
+            rss_mb = self.browser_rss_mb()
+            if rss_mb is not None and rss_mb > self.max_browser_rss_mb:
+                print(f"Recycling browser: using {rss_mb:.0f} MB (limit {self.max_browser_rss_mb} MB).")
+                return True
+        return False
+
+    def recycle_browser(self):
+        """
+        Restarts Chrome, logs in again and returns to the current results page.
+        """
+        with metrics.timer('scrape.recycle'):
+            page = self.current_page
+            try:
+                self.driver.quit()
+            except WebDriverException as e:
+                print(f"Error closing the old browser: {e}")
+            self.driver = self.start_browser()
+            self.wait = WebDriverWait(self.driver, 10)
+            self.cases_since_recycle = 0
+            self.results_handle = None
+
+            self._login()
+            if self.search_from is not None:
+                self._search_cases(0, from_date=self.search_from, to_date=self.search_to)
+                while self.current_page < page:
+                    self.go_to_next_page()
+        metrics.incr('scrape.recycles')
 
     def extract_defendant_and_plaintiff_details(self):
         """
@@ -193,52 +543,79 @@ class HarrisCountyScraper:
             print(f"Error extracting details: {e}")
             return ""
 
-    def scrape_cases(self):
-        processed_cases = set()
+    def scrape_cases(self, crawl_state=None):
+        """
+        Walks every results page, downloading and OCR-ing each matching case.
+
+        Args:
+            crawl_state (CrawlState | None): For incremental runs. Case numbers it already knows
+                are skipped straight from the results list, every processed case is recorded in it,
+                and its high-water mark is advanced to the search end date once the last page is done.
+        """
+        processed_cases = set(crawl_state.known_cases) if crawl_state is not None else set()
+        failed_attempts = {}
         while True:
             # Ensure the download directory is empty before processing the next case
             print("Ensuring download directory is empty before processing the next case...")
-            self.wait_until_download_dir_empty()
-
-            # Refresh the list of cases on the current results page
-            cases = self.driver.find_elements(By.XPATH, "//tr[contains(@class, 'even') or contains(@class, 'odd')]")
-            
-            # Build a list of unprocessed cases (as tuples of (case_element, case_number))
-            unprocessed_cases = []
-            for case in cases:
-                try:
-                    link_element = case.find_element(By.XPATH, ".//a[@class='doclinks']")
-                    case_number = link_element.text.strip()
-                except NoSuchElementException:
-                    case_number = "unknown_case_number"
-                if case_number not in processed_cases:
-                    unprocessed_cases.append((case, case_number))
+            with metrics.timer('scrape.download_dir_wait'):
+                self.wait_until_download_dir_empty()
+
+            # Long-run mode: start a fresh browser between cases if needed
+            if self.needs_recycle():
+                self.recycle_browser()
+
+            try:
+                with metrics.timer('scrape.page_parse'):
+                    # Refresh the list of cases on the current results page
+                    cases = self.driver.find_elements(By.XPATH, "//tr[contains(@class, 'even') or contains(@class, 'odd')]")
+
+                    # Build a list of unprocessed cases (as tuples of (case_element, case_number))
+                    unprocessed_cases = []
+                    for case in cases:
+                        try:
+                            link_element = case.find_element(By.XPATH, ".//a[@class='doclinks']")
+                            case_number = link_element.text.strip()
+                        except NoSuchElementException:
+                            case_number = "unknown_case_number"
+                        if case_number not in processed_cases:
+                            unprocessed_cases.append((case, case_number))
+            except StaleElementReferenceException:
+                # The page changed under us; reload the results page and read it again
+                print("Results list went stale; returning to the results page.")
+                metrics.incr('scrape.stale_recoveries')
+                self.return_to_results()
+                continue
             if not unprocessed_cases:
         # No unprocessed cases on the current page; check for a Next button
                 try:
                     next_button = self.driver.find_element(By.XPATH, "//a[text()='Next']")
                     if next_button.get_attribute('disabled') is None:
                         try:
-                            next_button.click()
+                            self.go_to_next_page()
                         except ElementClickInterceptedException as e:
                             print(f"ElementClickInterceptedException encountered: {e}. Continuing to next iteration.")
                             # Optionally, you can add a small wait here if needed:
                             # time.sleep(1)
                             continue  # Skip this iteration if click is intercepted
-                        # Wait until the next page's element is present
-                        self.wait.until(EC.presence_of_element_located(
-                            (By.ID, 'ctl00_ContentPlaceHolder1_ListViewCases_itemContainer')
-                        ))
                         continue  # Continue processing the new page
                     else:
                         print("Reached the last page.")
+                        if crawl_state is not None:
+                            self.complete_crawl(crawl_state, self.search_to)
                         break
                 except NoSuchElementException:
                     print("No 'Next' button found. Assuming last page reached.")
+                    if crawl_state is not None:
+                        self.complete_crawl(crawl_state, self.search_to)
                     break # No 'Next' button found; assume last page reached
 
             # Always process the first unprocessed case
             case, case_number = unprocessed_cases[0]
+            metrics.start_case(case_number, county=self.county)
+            # Set once the PDF is queued on the extraction pipeline, which then marks the case processed
+            submitted = False
+            # Set if the case's document could not be downloaded; such cases are retried next run
+            download_failed = False
             try:
                 # (Re)extract the case number to be sure
                 try:
@@ -253,9 +630,12 @@ class HarrisCountyScraper:
                     print(f'Processing case number: {case_number}...')
 
                     # Click the case to view its details
-                    case_link = case.find_element(By.XPATH, ".//a[@class='doclinks']")
-                    case_link.click()
-                    self.wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_gridViewEvents')))
+                    with metrics.timer('scrape.open_case'):
+                        case_link = case.find_element(By.XPATH, ".//a[@class='doclinks']")
+                        self.open_case(case_link)
+                    # Only opened cases count towards recycle_after_cases and trigger a memory check
+                    self.cases_since_recycle += 1
+                    self.rss_check_due = True
 
                     # Grab all documents from the "Events" (Nested_ChildGrid)
                     documents = self.driver.find_elements(By.XPATH, "//table[@class='Nested_ChildGrid']//tr")
@@ -273,8 +653,8 @@ class HarrisCountyScraper:
                             download_element = doc.find_element(By.XPATH, ".//a[contains(@id, 'HyperLinkFCEC')]")
                             download_link = download_element.get_attribute('href')
                             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Downloading - {doc_desc} to {self.download_dir}")
+                            self.throttle()
                             download_element.click()
-                            time.sleep(5)  # Pause for download to initiate
                             document_downloaded = True
                             break
 
@@ -282,7 +662,7 @@ class HarrisCountyScraper:
                     # If no document matched the criteria, choose the document with the most pages instead
                     if not document_downloaded:
                         print('document matching criteria not found; attempting to download the document with the most pages.')
-                        no_docs_path = '/Users/isaaclam/guardian/marketing_leads_project/main/out/harris/cases_with_no_matching_docs.txt'
+                        no_docs_path = os.path.join(os.path.dirname(self.output_file), 'cases_with_no_matching_docs.txt')
                         with open(no_docs_path, 'a', encoding='utf-8') as no_docs_file:
                             doc_titles_str = " | ".join(doc_titles)
                             print(f'Adding case_number: {case_number} to no-match log.')
@@ -308,8 +688,8 @@ class HarrisCountyScraper:
                             download_element = largest_doc.find_element(By.XPATH, ".//a[contains(@id, 'HyperLinkFCEC')]")
                             download_link = download_element.get_attribute('href')
                             print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Downloading document with {largest_pages} pages to {self.download_dir}")
+                            self.throttle()
                             download_element.click()
-                            time.sleep(5)  # Pause for download to initiate
                             document_downloaded = True
                         else:
                             print("No documents available for download.")
@@ -357,12 +737,8 @@ class HarrisCountyScraper:
 
                     # After downloading, wait for the PDF to appear
                     if document_downloaded and download_link:
-                        time.sleep(5)
-                        start_time = time.time()
-                        pdf_files = glob.glob(os.path.join(self.download_dir, "*.pdf"))
-                        while not pdf_files and (time.time() - start_time < self.download_wait_timeout):
-                            time.sleep(self.download_poll_interval)
-                            pdf_files = glob.glob(os.path.join(self.download_dir, "*.pdf"))
+                        with metrics.timer('scrape.download_wait'):
+                            pdf_files = self.wait_for_download()
 
                         # Click the Parties link to extract defendant/plaintiff details
                         try:
@@ -370,12 +746,17 @@ class HarrisCountyScraper:
                                 By.XPATH, 
                                 "//a[@href=\"javascript:__doPostBack('ctl00$ContentPlaceHolder1$gridViewCase','Parties$0')\"]"
                             )
-                            parties_link.click()
-                            self.wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_GridViewParties')))
-                            defendant_details = self.extract_defendant_and_plaintiff_details()
-                            self.driver.back()
-                            with open(self.output_file, 'a', encoding='utf-8') as file:
-                                file.write(f"{defendant_details}, \"{download_link}\"\n")
+                            with metrics.timer('scrape.parties'):
+                                self.throttle()
+                                parties_link.click()
+                                self.wait.until(EC.presence_of_element_located((By.ID, 'ctl00_ContentPlaceHolder1_GridViewParties')))
+                                defendant_details = self.extract_defendant_and_plaintiff_details()
+                            # No driver.back() here: return_to_results() below closes the case tab
+                            # With a shared extraction pipeline the row is written once OCR finishes
+                            if self.extraction_pipeline is None:
+                                with metrics.timer('output.write'):
+                                    with open(self.output_file, 'a', encoding='utf-8') as file:
+                                        file.write(f"{defendant_details}, \"{download_link}\"\n")
                         except Exception as e:
                             print(f"Error clicking or returning from Parties link: {e}")
                             defendant_details = ""
@@ -383,35 +764,59 @@ class HarrisCountyScraper:
                         # If a PDF file was found, process it for damages
                         if pdf_files:
                             most_recent_pdf = max(pdf_files, key=os.path.getctime)
-                            try:
-                                damages_result = process_pdf_and_find_damages(most_recent_pdf)
-                                if damages_result:
-                                    append_to_last_line(self.output_file, f", {damages_result}")
-                            except Exception as ocr_err:
-                                print(f"Error performing OCR on {most_recent_pdf}: {ocr_err}")
+                            if self.extraction_pipeline is not None:
+                                self.submit_for_extraction(
+                                    case_number, f"{defendant_details}, \"{download_link}\"", most_recent_pdf, crawl_state
+                                )
+                                submitted = True
+                            else:
+                                try:
+                                    with metrics.timer('ocr.pdf'):
+                                        damages_result = process_pdf_and_find_damages(most_recent_pdf)
+                                    if damages_result:
+                                        with metrics.timer('output.write'):
+                                            append_to_last_line(self.output_file, f", {damages_result}")
+                                except Exception as ocr_err:
+                                    metrics.incr('ocr.errors')
+                                    print(f"Error performing OCR on {most_recent_pdf}: {ocr_err}")
                         else:
+                            metrics.incr('scrape.download_missing')
+                            download_failed = True
+                            if self.extraction_pipeline is not None:
+                                # Nothing to OCR; still write the row, as run mode does
+                                self.write_output_row(f"{defendant_details}, \"{download_link}\"")
                             print(f"No PDF found in the download directory after waiting up to {self.download_wait_timeout} seconds.")
                     else:
+                        download_failed = True
                         print("Document was not downloaded successfully.")
                 else:
+                    metrics.incr('scrape.cases_skipped')
                     print(f"Skipping case number: {case_number} (type: {type_desc})")
                 
-                # Mark this case as processed regardless of outcome
+                # Mark this case as processed for this run regardless of outcome. Cases whose
+                # document could not be downloaded stay out of the crawl state so the next run retries them.
                 processed_cases.add(case_number)
+                if (crawl_state is not None and case_number != "unknown_case_number"
+                        and not submitted and not download_failed):
+                    crawl_state.mark_processed(case_number)
                 
                 # Navigate back to the search results page if not already there.
-                if "ctl00_ContentPlaceHolder1_ListViewCases_itemContainer" not in self.driver.page_source:
-                    print('Navigating back to search results...')
-                    self.driver.back()
-                    self.wait.until(EC.presence_of_element_located(
-                        (By.ID, 'ctl00_ContentPlaceHolder1_ListViewCases_itemContainer')
-                    ))
+                self.return_to_results()
+                metrics.end_case(type_desc=type_desc)
+            except StaleElementReferenceException:
+                # The results list was re-rendered before the case was opened; read it again
+                print(f"Case {case_number} went stale; returning to the results page.")
+                metrics.incr('scrape.stale_recoveries')
+                metrics.end_case(error='stale')
+                self.record_case_failure(case_number, failed_attempts, processed_cases)
+                self.recover_results_page()
+                continue
             except Exception as e:
                 print(f"Error processing case: {e}")
-                self.driver.execute_script("window.history.go(-1)")
-                self.wait.until(EC.presence_of_element_located(
-                    (By.ID, 'ctl00_ContentPlaceHolder1_ListViewCases_itemContainer')
-                ))
+                metrics.incr('scrape.case_errors')
+                metrics.end_case(error=str(e))
+                self.record_case_failure(case_number, failed_attempts, processed_cases)
+                self.recover_results_page()
                 continue
             # The loop will now refresh the case list and process the next unprocessed case.
  
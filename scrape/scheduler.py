@@ -0,0 +1,181 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from metrics import metrics
+from scrape.county_scraper import RateLimiter, load_scraper_class
+
+# -----------------------
+# Shared output sink
+# -----------------------
+class OutputSink:
+    """
+    Serializes all output writes from every county through one lock.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+
+    def write(self, output_file, line):
+        with metrics.timer('output.write'):
+            with self.lock:
+                with open(output_file, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+
+# -----------------------
+# Shared OCR/extraction pool
+# -----------------------
+def _init_worker(metrics_enabled):
+    # Spawned workers start with metrics off; collect them here if the parent collects them
+    if metrics_enabled:
+        metrics.configure()
+
+def _extract(pdf_path):
+    # Runs in a worker process; imports the OCR stack there.
+    # Returns the result plus the worker's ocr.*/llm.* timings for the parent to merge.
+    from ocr.ocr import process_pdf_and_find_damages
+    metrics.start_case(pdf_path)
+    try:
+        result = process_pdf_and_find_damages(pdf_path)
+    except Exception:
+        metrics.detach_case()
+        raise
+    return result, metrics.detach_case()
+
+class ExtractionPipeline:
+    """
+    One process pool that OCRs and extracts PDFs for every county scraper.
+    Each finished PDF is written to its county's output file as '<row>, <result>', and only
+    then is the case marked processed in the county's crawl state.
+    """
+    def __init__(self, workers=2, sink=None):
+        # 'spawn' so workers are not forked from a process running browser threads
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(metrics.enabled,),
+        )
+        self.sink = sink or OutputSink()
+        self.pending = {}
+        self.failed = 0
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+
+    def submit(self, county, case_number, output_file, row, pdf_path, crawl_state=None):
+        """
+        Queues a PDF for OCR. Must be called on the scraper's thread while its metrics case
+        is open: the case stays open until the PDF's row is written.
+        """
+        with self.lock:
+            self.pending[county] = self.pending.get(county, 0) + 1
+        metrics.incr('pipeline.submitted')
+        case_metrics = metrics.hold_case()
+        future = self.executor.submit(_extract, pdf_path)
+        future.add_done_callback(
+            lambda f: self._done(f, county, case_number, output_file, row, pdf_path, crawl_state, case_metrics)
+        )
+
+    def _done(self, future, county, case_number, output_file, row, pdf_path, crawl_state, case_metrics):
+        worker_metrics = None
+        try:
+            result, worker_metrics = future.result()
+            self.sink.write(output_file, f"{row}, {result}" if result else row)
+        except Exception as e:
+            print(f"[{county}] Error performing OCR on {pdf_path} (case {case_number}): {e}")
+            metrics.incr('ocr.errors')
+            with self.lock:
+                self.failed += 1
+            self.sink.write(output_file, row)
+        finally:
+            metrics.release_case(case_metrics, worker_metrics)
+            with self.lock:
+                self.pending[county] -= 1
+                self.idle.notify_all()
+        # The row is written, so an interrupted run will not lose this case
+        if crawl_state is not None:
+            crawl_state.mark_processed(case_number)
+
+    def wait(self, county=None):
+        """
+        Blocks until every queued PDF (or just the given county's) has been written.
+        """
+        with self.lock:
+            while (self.pending.get(county, 0) if county is not None else sum(self.pending.values())):
+                self.idle.wait()
+
+    def close(self):
+        """
+        Waits for every queued PDF to be written, then shuts the pool down.
+        """
+        self.wait()
+        self.executor.shutdown()
+
+# -----------------------
+# CrawlScheduler Class
+# -----------------------
+class SiteJob:
+    """
+    One county to crawl.
+
+    Args:
+        county (str): Name registered in scrape.county_scraper.SCRAPER_CLASSES.
+        scraper_kwargs (dict): Keyword arguments for the scraper class (credentials, paths, ...).
+        days (int): Search window in days.
+        crawl_state (CrawlState | None): Incremental crawl state for this county.
+        requests_per_minute (float | None): Rate limit for this site.
+    """
+    def __init__(self, county, scraper_kwargs, days=7, crawl_state=None, requests_per_minute=None):
+        self.county = county
+        self.scraper_kwargs = scraper_kwargs
+        self.days = days
+        self.crawl_state = crawl_state
+        self.rate_limiter = RateLimiter(requests_per_minute)
+
+class CrawlScheduler:
+    """
+    Runs several county scrapers concurrently (one browser thread per site), each with its
+    own rate limiter, all feeding one shared extraction pipeline and output sink.
+    """
+    def __init__(self, jobs, ocr_workers=2):
+        self.jobs = jobs
+        self.ocr_workers = ocr_workers
+
+    def run_job(self, job, pipeline):
+        start = time.perf_counter()
+        scraper = None
+        try:
+            scraper = load_scraper_class(job.county)(**job.scraper_kwargs)
+            scraper.rate_limiter = job.rate_limiter
+            scraper.extraction_pipeline = pipeline
+
+            scraper.login()
+            if job.crawl_state is not None:
+                scraper.search_cases(days=job.days, from_date=job.crawl_state.search_from_date(default_days=job.days))
+            else:
+                scraper.search_cases(days=job.days)
+            scraper.scrape_cases(crawl_state=job.crawl_state)
+            error = None
+        except Exception as e:
+            print(f"[{job.county}] Crawl failed: {e}")
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            if scraper is not None:
+                scraper.quit()
+        return {'county': job.county, 'error': error, 'elapsed_s': time.perf_counter() - start}
+
+    def run(self):
+        """
+        Crawls every site and waits for all extractions to finish.
+        Returns one result dict per county.
+        """
+        pipeline = ExtractionPipeline(workers=self.ocr_workers)
+        try:
+            with ThreadPoolExecutor(max_workers=len(self.jobs), thread_name_prefix='crawl') as executor:
+                results = list(executor.map(lambda job: self.run_job(job, pipeline), self.jobs))
+        finally:
+            pipeline.close()
+        for result in results:
+            status = 'ok' if result['error'] is None else result['error']
+            print(f"[{result['county']}] finished in {result['elapsed_s']:.1f}s: {status}")
+        return results